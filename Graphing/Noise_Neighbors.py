@@ -1,12 +1,16 @@
+# Run from the repository root with: python3 -m Graphing.Noise_Neighbors
 import time
 import numpy as np
 import itertools
 import random
 
+from golnoise import markov
+
 noise = 0
 n_trials = 20
 n_generations = 250
 grid_size = 3  # size of the grid
+exact = True  # solve the Markov chain exactly (grid_size <= 4) instead of sampling n_trials runs
 
 # Generate all possible 3x3 combinations
 combinations = list(itertools.product([0, 1], repeat=9))
@@ -31,19 +35,28 @@ def update(cells):
 
     return np.where(np.logical_or(born, survive), 1, 0)
 
+def seed(combination):
+    cells = np.zeros((grid_size, grid_size))
+    start_row, start_col = grid_size // 2 - 1, grid_size // 2 - 1
+    cells[start_row:start_row+3, start_col:start_col+3] = combination
+    return cells
+
 def main():
     all_sums = []
 
-    for combination in combinations:
-        sums = []
-        for _ in range(n_trials):
-            cells = np.zeros((grid_size, grid_size))
-            start_row, start_col = grid_size // 2 - 1, grid_size // 2 - 1
-            cells[start_row:start_row+3, start_col:start_col+3] = combination
-            for _ in range(n_generations):
-                cells = update(cells)
-            sums.append(np.sum(cells))
-        all_sums.append(np.mean(sums))
+    if exact:
+        # Expected final population of every combination, no sampling
+        initial_states = [markov.state_index(seed(combination)) for combination in combinations]
+        all_sums, _ = markov.population_moments((grid_size, grid_size), noise, initial_states, n_generations)
+    else:
+        for combination in combinations:
+            sums = []
+            for _ in range(n_trials):
+                cells = seed(combination)
+                for _ in range(n_generations):
+                    cells = update(cells)
+                sums.append(np.sum(cells))
+            all_sums.append(np.mean(sums))
 
     mean_of_means = np.mean(all_sums)
     std_dev = np.std(all_sums)
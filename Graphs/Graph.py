@@ -1,12 +1,15 @@
+# Run from the repository root with: python3 -m Graphs.Graph
 import numpy as np
 import matplotlib.pyplot as plt
 import os
 from pathlib import Path
-import sys
 
-# Assuming the parent folder of the script folder is in the PYTHONPATH
-sys.path.append('..')  # Adjust this path based on your folder structure
-import NoiseMainModified as treatment
+from golnoise import meanfield, rules
+from golnoise.seeds import SeedLibrary
+
+# Rule being graphed: rules.noise_main is NoiseMainModified.py's update without pygame
+treatment = rules.noise_main
+here = Path(__file__).resolve().parent
 
 # Parameters for the simulation
 num_configs = 10
@@ -15,25 +18,25 @@ alive_probability = 0.25
 num_timesteps = 250
 noise_levels = [0, 0.01, 0.1, 0.5, 0.9, 1.0]
 
-# Load initial configurations
-initial_configurations = np.load('initial_configurations.npy', allow_pickle=True)
+# Load initial configurations (written by Graphs/initial_configs.py, read on demand)
+initial_configurations = SeedLibrary(str(here / 'initial_configurations'))
 
 # Use 'initial_configurations' in your simulations
 
 
 # Create a folder to store the graphs
-graph_folder_path = 'main'  # Adjust the path as needed
+graph_folder_path = here / 'main'  # Adjust the path as needed
 Path(graph_folder_path).mkdir(parents=True, exist_ok=True)
 
 def run_simulation_and_create_graph(noise_level, initial_configs, num_timesteps, folder_path):
     avg_alive_percentages = np.zeros(num_timesteps)
 
     for config in initial_configs:
-        cells = np.copy(config)
+        cells = config
         alive_percentages = []
 
         for _ in range(num_timesteps):
-            cells = treatment.update(cells, noise_level)  # Update the cells based on your modified NoiseMain.py
+            cells = treatment(cells, noise_level)  # Update the cells based on your modified NoiseMain.py
             alive_percent = np.sum(cells) / cells.size
             alive_percentages.append(alive_percent)
 
@@ -41,9 +44,14 @@ def run_simulation_and_create_graph(noise_level, initial_configs, num_timesteps,
 
     avg_alive_percentages /= len(initial_configs)
 
+    # Pair-approximation prediction from the same starting density, for comparison
+    initial_density = np.mean([np.mean(config) for config in initial_configs])
+    predicted = meanfield.pair_approximation(initial_density, noise_level, num_timesteps)[1:]
+
     # Plotting
     plt.figure(figsize=(10, 6))
     plt.plot(range(num_timesteps), avg_alive_percentages, label=f"Noise Level: {noise_level}")
+    plt.plot(range(num_timesteps), predicted, '--', label="Pair approximation")
     plt.xlabel('Timestep')
     plt.ylabel('% of Cells Alive')
     plt.title(f'Average % of Cells Alive Over Time (Noise Level {noise_level}), main')
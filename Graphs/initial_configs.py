@@ -0,0 +1,18 @@
+# Run from the repository root with: python3 -m Graphs.initial_configs
+from pathlib import Path
+
+from golnoise import seeds
+
+here = Path(__file__).resolve().parent
+
+# Parameters for the simulation
+num_configs = 10
+grid_size = (60, 80)
+alive_probability = 0.25
+
+# Describe the initial configurations as a recipe: nothing but the entropy, density and
+# shape is written, and each configuration is regenerated when it is read
+library = seeds.write_recipe(str(here / 'initial_configurations'), num_configs, grid_size, alive_probability)
+
+# To keep a fixed set instead, store it bit-packed:
+# seeds.write_packed(str(here / 'initial_configurations'), library.batch(0, num_configs))
@@ -65,11 +65,7 @@ def main():
     pygame.init()
     screen = pygame.display.set_mode((800, 600))
 
-    total_cells = 60 * 80
-    alive_cells = int(total_cells * random_percent_pop)
-    cells_flat = np.concatenate([np.ones(alive_cells), np.zeros(total_cells - alive_cells)])
-    np.random.shuffle(cells_flat)
-    cells = cells_flat.reshape(60, 80)
+    # For a sweep over random_percent_pop and noise_probability use golnoise/phase.py
     cells = np.random.choice([0, 1], size=(60, 80), p=[1 - random_percent_pop, random_percent_pop])
 
     render(screen, cells, 10)
@@ -1,8 +1,15 @@
+# Run from the repository root with: PYTHONPATH=. python3 VisualizingNoise/VisualizingNoise4.0.py
 import time
+from pathlib import Path
+
 import pygame
 import numpy as np
 from scipy.ndimage import convolve
 
+from golnoise.frames import FrameStore
+
+here = Path(__file__).resolve().parent
+
 COLOR_BG = (10, 10, 10)
 COLOR_GRID = (40, 40, 40)
 COLOR_DIE_NEXT = (170, 170, 170)
@@ -123,13 +130,18 @@ def main():
     running = False
     cell_deactivation = False
 
-    history = []
+    # History is streamed to disk (one frame per generation) instead of kept in a list,
+    # so long runs can be scrubbed without holding every snapshot in memory
+    history_cells = FrameStore(str(here / 'history_cells'), cells.shape, mode='w')
+    history_alive = FrameStore(str(here / 'history_alive'), cells.shape, dtype=np.int8, binary=False, mode='w')
 
 
     while True:
         for event in pygame.event.get():
 
             if event.type == pygame.QUIT:
+                history_cells.close()
+                history_alive.close()
                 pygame.quit()
                 return
 
@@ -143,8 +155,12 @@ def main():
                 # Advance generation using arrow keys
                 elif event.key == pygame.K_RIGHT:  # move forward one generation
 
-                    # Push the current state to history before updating
-                    history.append((np.copy(cells), alive.copy(), generation))
+                    # Push the current state to history before updating, replacing any
+                    # generations we stepped back over
+                    history_cells.truncate(generation)
+                    history_alive.truncate(generation)
+                    history_cells.append(cells)
+                    history_alive.append(alive)
 
                     cells = update_grid(cells, alive)
 
@@ -162,8 +178,10 @@ def main():
 
                 elif event.key == pygame.K_LEFT and generation > 0:  # move back one generation
 
-                    #Pop the previous state from history
-                    cells, alive, generation = history.pop()
+                    # Seek back to the previous state in history
+                    generation -= 1
+                    cells = history_cells.frame(generation).astype(cells.dtype)
+                    alive = history_alive.frame(generation).astype(alive.dtype)
 
                     # After popping the state from history, render both grids again:
                     render_neighbor_matrix(screen, alive, cells, 10, 800)
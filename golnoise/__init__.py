@@ -0,0 +1,22 @@
+# Batched engine for the noisy Game of Life experiments
+# The scripts in the other folders each carry their own copy of update(); the modules
+# here step many trials at once and are shared by the sweep runners
+#
+# Nothing here imports a GUI or plotting library, and submodules load on first use:
+# `import golnoise` is instant and golnoise.engine imports the engine when touched
+
+import importlib
+
+modules = ("bitslice", "census", "disk", "engine", "figures", "fitting", "frames", "hashlife", "ltl",
+           "markov", "meanfield", "phase", "pool", "query", "rules", "seeds", "significance", "sparse",
+           "store", "strips", "surrogate", "sweep", "telemetry", "trajectory")
+
+
+def __getattr__(name):
+    if name in modules:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(modules))
@@ -0,0 +1,86 @@
+# Optional compiled kernels, built with numba when it is installed
+# Each kernel fuses neighbor counting, the +/-1 count noise and the B3/S23 decision
+# into a single pass over the grid, so no temporary arrays are created per generation
+#
+# numba itself is only imported the first time a kernel is used, so importing the engine
+# (and starting a worker) stays cheap on runs that never take the numba backend
+
+import importlib.util
+
+import numpy as np
+
+available = importlib.util.find_spec('numba') is not None
+
+_kernels = {}
+
+
+def _build():
+    from numba import njit, prange
+
+    @njit(cache=True)
+    def seed(value):
+        """Seed numba's generator for the calling thread."""
+        np.random.seed(value)
+
+    @njit(parallel=True, cache=True)
+    def step_trials(src, dst, noise, wrap, sparse_below):
+        """Advance every trial in src by one generation, writing into dst in place.
+
+        noise holds the noise level of every trial. Levels below sparse_below skip from one
+        noisy cell to the next with geometric draws instead of drawing for every cell.
+        """
+        n_trials, rows, cols = src.shape
+
+        for t in prange(n_trials):
+            trial_noise = noise[t]
+            half_noise = trial_noise * 0.5
+            sparse = 0.0 < trial_noise < sparse_below
+            if sparse:
+                log_keep = np.log1p(-trial_noise)
+                next_event = int(np.log(1.0 - np.random.random()) / log_keep)
+            for r in range(rows):
+                for c in range(cols):
+                    alive = 0
+                    for dr in range(-1, 2):
+                        rr = r + dr
+                        if wrap:
+                            rr %= rows
+                        elif rr < 0 or rr >= rows:
+                            continue
+                        for dc in range(-1, 2):
+                            if dr == 0 and dc == 0:
+                                continue
+                            cc = c + dc
+                            if wrap:
+                                cc %= cols
+                            elif cc < 0 or cc >= cols:
+                                continue
+                            alive += src[t, rr, cc]
+
+                    # "noise" modification, one uniform draw decides both whether and which way
+                    # (no clip needed: a count of -1 decides the same way as 0)
+                    if sparse:
+                        if r * cols + c == next_event:
+                            alive += 1 if np.random.random() < 0.5 else -1
+                            next_event += 1 + int(np.log(1.0 - np.random.random()) / log_keep)
+                    elif trial_noise > 0.0:
+                        u = np.random.random()
+                        if u < half_noise:
+                            alive -= 1
+                        elif u < trial_noise:
+                            alive += 1
+
+                    if alive == 3 or (alive == 2 and src[t, r, c] == 1):
+                        dst[t, r, c] = 1
+                    else:
+                        dst[t, r, c] = 0
+
+    _kernels.update(seed=seed, step_trials=step_trials)
+
+
+def __getattr__(name):
+    if name in ('seed', 'step_trials') and available:
+        if not _kernels:
+            _build()
+        return _kernels[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
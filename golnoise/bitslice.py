@@ -0,0 +1,142 @@
+# Bit-sliced engine: 64 trials per uint64 word
+# Bit k of words[w, row, col] is cell (row, col) of trial 64 * w + k, so a 100-trial batch
+# is two words per cell. A generation works on whole words: the eight shifted neighbor
+# planes go through an adder network into a 4-bit count (one bit plane each), and the
+# B3/S23 decision is a handful of AND/OR/NOT on those planes
+#
+# Noise is injected as random bit masks. A lane is noised with probability noise (its own
+# value per trial) through the binary expansion of noise: starting from the lowest digit,
+# mask = r | mask where the digit is 1 and r & mask where it is 0, with r a fresh random
+# word; noise is therefore rounded to noise_bits binary digits. A second random word picks
+# +1 or -1 for every noised lane.
+# Run through engine.run(..., backend='bitslice') or bitslice.run directly
+
+import numpy as np
+
+noise_bits = 16  # noise is rounded to a multiple of 2**-noise_bits
+lanes = 64
+
+
+def pack(cells):
+    """(n_trials, rows, cols) 0/1 batch as (ceil(n_trials / 64), rows, cols) uint64 words."""
+    n_trials, rows, cols = cells.shape
+    n_words = -(-n_trials // lanes)
+    padded = np.zeros((n_words * lanes, rows, cols), dtype=np.uint8)
+    padded[:n_trials] = cells
+    bits = padded.reshape(n_words, lanes, rows, cols).transpose(0, 2, 3, 1)
+    return np.ascontiguousarray(np.packbits(bits, axis=-1, bitorder='little')).view('<u8')[..., 0]
+
+
+def unpack(words, n_trials):
+    """Inverse of pack: the first n_trials trials as a (n_trials, rows, cols) uint8 batch."""
+    n_words, rows, cols = words.shape
+    bits = np.unpackbits(words.astype('<u8')[..., None].view(np.uint8), axis=-1, bitorder='little')
+    return np.ascontiguousarray(bits.transpose(0, 3, 1, 2).reshape(n_words * lanes, rows, cols)[:n_trials])
+
+
+def population(words, n_trials):
+    """Live cells of each trial."""
+    counts = np.unpackbits(words.astype('<u8')[..., None].view(np.uint8), axis=-1, bitorder='little')
+    return counts.sum(axis=(1, 2), dtype=np.int64).reshape(-1)[:n_trials]
+
+
+def noise_digits(noise, n_trials):
+    """Lane masks of noise's binary digits, as a (noise_bits + 1, n_words) uint64 array.
+
+    Row i holds bit i of round(noise * 2**noise_bits) for every lane, lowest digit first;
+    the last row is only set for lanes with noise = 1.
+    """
+    noise = np.broadcast_to(np.asarray(noise, dtype=np.float64).ravel(), n_trials)
+    fixed = np.minimum(np.round(noise * 2 ** noise_bits), 2 ** noise_bits).astype(np.uint64)
+    n_words = -(-n_trials // lanes)
+    lane_values = np.zeros(n_words * lanes, dtype=np.uint64)
+    lane_values[:n_trials] = fixed
+
+    weights = np.uint64(1) << np.arange(lanes, dtype=np.uint64)
+    digits = np.zeros((noise_bits + 1, n_words), dtype=np.uint64)
+    for digit in range(noise_bits + 1):
+        set_lanes = ((lane_values >> np.uint64(digit)) & np.uint64(1)).reshape(n_words, lanes)
+        digits[digit] = (set_lanes * weights).sum(axis=1, dtype=np.uint64)
+    return digits
+
+
+def bernoulli_mask(digits, shape, rng):
+    """Random words whose bit k is 1 with lane k's probability, from noise_digits.
+
+    Costs one random word per digit from the lowest one set in any lane, so noise = 0.5
+    takes one word and noise = 0.001 the full noise_bits.
+    """
+    mask = np.zeros(shape, dtype=np.uint64)
+    fractional = digits[:noise_bits]
+    used = np.flatnonzero(fractional.any(axis=1))
+    for digit in fractional[used[0] if len(used) else noise_bits:]:
+        digit = digit[:, None, None]
+        r = rng.bit_generator.random_raw(shape)
+        mask = (digit & (r | mask)) | (~digit & r & mask)
+    return mask | digits[noise_bits][:, None, None]
+
+
+def _full_add(a, b, c):
+    partial = a ^ b
+    return partial ^ c, (a & b) | (c & partial)
+
+
+def neighbor_planes(words, boundary='constant'):
+    """The eight shifted copies of words, one per neighbor direction."""
+    mode = 'wrap' if boundary == 'wrap' else 'constant'
+    padded = np.pad(words, ((0, 0), (1, 1), (1, 1)), mode=mode)
+    rows, cols = words.shape[1:]
+    return [padded[:, 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+            for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+def count_planes(words, boundary='constant'):
+    """Bit planes (1, 2, 4, 8) of every cell's live-neighbor count, via an adder network."""
+    n = neighbor_planes(words, boundary)
+    s0, c0 = _full_add(n[0], n[1], n[2])
+    s1, c1 = _full_add(n[3], n[4], n[5])
+    s2, c2 = n[6] ^ n[7], n[6] & n[7]
+    ones, c3 = _full_add(s0, s1, s2)
+    t0, d0 = _full_add(c0, c1, c2)
+    twos, d1 = t0 ^ c3, t0 & c3
+    return ones, twos, d0 ^ d1, d0 & d1
+
+
+def step(words, digits, rng, boundary='constant'):
+    """One noisy generation of packed words; digits from noise_digits."""
+    ones, twos, fours, eights = count_planes(words, boundary)
+    low = ~fours & ~eights  # count below 4
+    eq1 = low & ones & ~twos
+    eq2 = low & ~ones & twos
+    eq3 = low & ones & twos
+    eq4 = fours & ~ones & ~twos & ~eights
+
+    life = eq3 | (eq2 & words)
+    if not digits.any():
+        return life
+
+    # Noised lanes see count + 1 (plus) or count - 1 (minus)
+    noised = bernoulli_mask(digits, words.shape, rng)
+    up = rng.bit_generator.random_raw(words.shape)
+    plus, minus = noised & up, noised & ~up
+    return (~noised & life) | (plus & (eq2 | (eq1 & words))) | (minus & (eq4 | (eq3 & words)))
+
+
+def run(cells, noise, n_generations, rng=None, boundary='constant', recorder=None):
+    """Advance a (n_trials, rows, cols) batch n_generations times; returns a new batch.
+
+    noise is a scalar or one value per trial. A TrajectoryRecorder passed as recorder sees
+    the generations it samples, each unpacked for it.
+    """
+    rng = np.random.default_rng(rng)
+    every = getattr(recorder, "every", 1)
+    n_trials = len(cells)
+    words = pack(cells)
+    digits = noise_digits(noise, n_trials)
+    if recorder is not None:
+        recorder.record(0, cells)
+    for generation in range(1, n_generations + 1):
+        words = step(words, digits, rng, boundary)
+        if recorder is not None and generation % every == 0:
+            recorder.record(generation, unpack(words, n_trials))
+    return unpack(words, n_trials)
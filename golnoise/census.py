@@ -0,0 +1,120 @@
+# Census of the objects left on the board at the end of a trial
+# Replaces naming final states by hand (the Name column of csvs/100TrialswithPatternNames.csv,
+# the Shape*.png images): every group of live cells (see label) is cut out, reduced to a
+# canonical form under the 8 rotations and reflections, and looked up in a catalogue of
+# common still lifes, oscillators (every phase) and spaceships; anything else is 'other'
+#
+# Labeling runs once over the whole (trial, row, col) batch. Canonical forms are cached by
+# the exact cut-out, so after the first few trials almost every object is a dict lookup
+
+import functools
+
+import numpy as np
+from scipy import ndimage
+
+from golnoise import engine
+
+# name: (period, pattern); oscillators and spaceships contribute every phase
+objects = {
+    "block": (1, ["OO", "OO"]),
+    "beehive": (1, [".OO.", "O..O", ".OO."]),
+    "loaf": (1, [".OO.", "O..O", ".O.O", "..O."]),
+    "boat": (1, ["OO.", "O.O", ".O."]),
+    "ship": (1, ["OO.", "O.O", ".OO"]),
+    "tub": (1, [".O.", "O.O", ".O."]),
+    "pond": (1, [".OO.", "O..O", "O..O", ".OO."]),
+    "long boat": (1, ["OO..", "O.O.", ".O.O", "..O."]),
+    "barge": (1, [".O..", "O.O.", ".O.O", "..O."]),
+    "snake": (1, ["OO.O", "O.OO"]),
+    "aircraft carrier": (1, ["OO..", "O..O", "..OO"]),
+    "blinker": (2, ["OOO"]),
+    "toad": (2, [".OOO", "OOO."]),
+    "beacon": (2, ["OO..", "OO..", "..OO", "..OO"]),
+    "glider": (4, [".O.", "..O", "OOO"]),
+    "lightweight spaceship": (4, [".O..O", "O....", "O...O", "OOOO."]),
+    "middleweight spaceship": (4, ["...O..", ".O...O", "O.....", "O....O", "OOOOO."]),
+    "heavyweight spaceship": (4, ["...OO..", ".O....O", "O......", "O.....O", "OOOOOO."]),
+}
+
+names = tuple(objects) + ("other",)
+other = len(names) - 1
+
+# Connected in the 8 directions within a slice, never across trials
+structure = np.zeros((3, 3, 3), dtype=bool)
+structure[1] = True
+
+
+def label(cells):
+    """Label every object of a batch: live cells at most 2 apart (in both directions) join.
+
+    Growing each cell one step down and right first makes cells 2 apart touch, so phases
+    like the toad's or beacon's, whose halves are not 8-connected, stay one object.
+    """
+    grown = cells.astype(bool)
+    grown[:, 1:] |= grown[:, :-1]
+    grown[:, :, 1:] |= grown[:, :, :-1]
+    labels, n = ndimage.label(grown, structure)
+    labels *= cells.astype(bool)
+    return labels, n
+
+
+def _key(crop):
+    return crop.shape, np.packbits(crop).tobytes()
+
+
+def canonical(crop):
+    """Smallest key among the 8 rotations and reflections of a boolean cut-out."""
+    return min(_key(np.ascontiguousarray(np.rot90(flipped, turns)))
+               for flipped in (crop, crop.T) for turns in range(4))
+
+
+@functools.lru_cache(maxsize=None)
+def catalogue():
+    """Canonical key of every phase of every catalogued object, mapped to its index in names."""
+    known = {}
+    for index, (period, rows) in enumerate(objects.values()):
+        pattern = np.array([[char == "O" for char in row] for row in rows], dtype=engine.state_dtype)
+        cells = np.zeros((1,) + tuple(np.add(pattern.shape, 8)), dtype=engine.state_dtype)
+        cells[0, 4:-4, 4:-4] = pattern
+        for _ in range(period):
+            labels, n = label(cells)
+            if n == 1:
+                known.setdefault(canonical(cells[0][ndimage.find_objects(labels)[0][1:]] > 0), index)
+            cells = engine.update(cells, 0)
+    return known
+
+
+_lookup = {}
+
+
+def classify(crop):
+    """Index in names of a boolean cut-out holding one object."""
+    key = _key(crop)
+    if key not in _lookup:
+        _lookup[key] = catalogue().get(canonical(crop), other)
+    return _lookup[key]
+
+
+def count(cells):
+    """(trial, name) counts of each catalogued object in a (trial, row, col) batch."""
+    counts = np.zeros((len(cells), len(names)), dtype=np.int32)
+    labels, _ = label(cells)
+    for index, box in enumerate(ndimage.find_objects(labels), 1):
+        if box is None:
+            continue
+        crop = labels[box][0] == index
+        kind = classify(crop)
+        if kind == other:
+            # Unknown as a whole: count its 8-connected pieces instead, which splits
+            # constellations like the four blinkers of a traffic light
+            pieces, _ = ndimage.label(crop, structure[1])
+            for piece, piece_box in enumerate(ndimage.find_objects(pieces), 1):
+                counts[box[0].start, classify(pieces[piece_box] == piece)] += 1
+        else:
+            counts[box[0].start, kind] += 1
+    return counts
+
+
+def describe(counts):
+    """'2 block, 1 blinker' style summary of one row of counts."""
+    return ", ".join(f"{n} {name}" for name, n in zip(names, counts) if n) or "empty"
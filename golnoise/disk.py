@@ -0,0 +1,129 @@
+# Boards larger than RAM, kept bit-packed on disk and stepped a strip of rows at a time
+# A board at <path> is <path>.bits.npy, one bit per cell packed along the rows (a 200,000 x
+# 200,000 board is 5 GB), plus <path>.json with its shape. A generation reads the board
+# through a memmap in strips of strip_rows rows, steps each strip with engine.step_into and
+# writes the result to <path>.next.bits.npy; the two files then swap roles
+#
+# Every byte is read and written once per generation, in order: the row above a strip is
+# carried over from the previous strip instead of re-read, and the next strip is read on a
+# background thread while the current one steps
+
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from golnoise import engine
+
+strip_rows = 256
+
+
+def _advise(bits):
+    # Tell the kernel the file is read front to back so it reads ahead aggressively
+    if hasattr(bits, '_mmap') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        bits._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+
+class DiskBoard:
+    """A (rows, cols) board stored bit-packed in a memory-mapped file."""
+
+    def __init__(self, path, mode='r+'):
+        self.path = path
+        self.mode = mode
+        with open(path + ".json") as file:
+            self.shape = tuple(json.load(file)["shape"])
+        self.bits = np.load(path + ".bits.npy", mmap_mode=mode)
+
+    @classmethod
+    def create(cls, path, shape):
+        """An all-dead board of the given shape."""
+        rows, cols = shape
+        np.lib.format.open_memmap(path + ".bits.npy", mode='w+', dtype=np.uint8,
+                                  shape=(rows, (cols + 7) // 8)).flush()
+        with open(path + ".json", 'w') as file:
+            json.dump({"shape": [rows, cols]}, file)
+        return cls(path)
+
+    @classmethod
+    def random(cls, path, shape, density=0.5, entropy=None, strip_rows=strip_rows):
+        """A random soup like NoiseMain.py's, written strip by strip."""
+        board = cls.create(path, shape)
+        rng = np.random.default_rng(entropy)
+        for start in range(0, shape[0], strip_rows):
+            stop = min(start + strip_rows, shape[0])
+            board.bits[start:stop] = np.packbits(rng.random((stop - start, shape[1])) < density, axis=-1)
+        board.bits.flush()
+        return board
+
+    def rows(self, start, stop):
+        """Rows start..stop-1 unpacked to uint8."""
+        return np.unpackbits(self.bits[start:stop], axis=-1, count=self.shape[1])
+
+    def to_array(self):
+        return self.rows(0, self.shape[0])
+
+    def population(self, strip_rows=strip_rows):
+        return sum(int(self.rows(start, start + strip_rows).sum(dtype=np.int64))
+                   for start in range(0, self.shape[0], strip_rows))
+
+    def step(self, noise, scratch, boundary='constant', strip_rows=strip_rows):
+        """Write the next generation to <path>.next.bits.npy, swap files and return the population."""
+        rows, cols = self.shape
+        wrap = boundary == 'wrap'
+        next_bits = np.lib.format.open_memmap(self.path + ".next.bits.npy", mode='w+', dtype=np.uint8,
+                                              shape=self.bits.shape)
+        _advise(self.bits)
+
+        window = np.zeros((1, strip_rows + 2, cols), dtype=engine.state_dtype)
+        above = self.rows(rows - 1, rows)[0] if wrap else np.zeros(cols, dtype=engine.state_dtype)
+        first = self.rows(0, 1)[0]
+        population = 0
+
+        def read(start):
+            # The strip plus the row below it
+            return np.array(self.bits[start:min(start + strip_rows + 1, rows)])
+
+        with ThreadPoolExecutor(1) as reader:
+            pending = reader.submit(read, 0)
+            for start in range(0, rows, strip_rows):
+                stop = min(start + strip_rows, rows)
+                height = stop - start
+                packed = pending.result()
+                if stop < rows:
+                    pending = reader.submit(read, stop)
+
+                strip = window[:, :height + 2]
+                strip[0, 0] = above
+                strip[0, 1:len(packed) + 1] = np.unpackbits(packed, axis=-1, count=cols)
+                if stop == rows:
+                    strip[0, -1] = first if wrap else 0
+                above = strip[0, height].copy()
+
+                views = {key: value[:, :height + 2] if isinstance(value, np.ndarray) else value
+                         for key, value in scratch.items()}
+                result = engine.step_into(strip, views["state"], views, noise, boundary)[0, 1:-1]
+                next_bits[start:stop] = np.packbits(result, axis=-1)
+                population += int(result.sum(dtype=np.int64))
+
+        next_bits.flush()
+        del next_bits
+        self._swap()
+        return population
+
+    def _swap(self):
+        current, following = self.path + ".bits.npy", self.path + ".next.bits.npy"
+        self.bits = None
+        os.replace(current, current + ".tmp")
+        os.replace(following, current)
+        os.replace(current + ".tmp", following)
+        self.bits = np.load(current, mmap_mode=self.mode)
+
+
+def run(path, noise, n_generations, rng=None, boundary='constant', strip_rows=strip_rows):
+    """Advance the board at path n_generations times in place and return its population per generation."""
+    board = DiskBoard(path)
+    scratch = engine.make_scratch((1, strip_rows + 2, board.shape[1]), backend='numpy',
+                                  rng=np.random.default_rng(rng))
+    return np.array([board.step(noise, scratch, boundary, strip_rows) for _ in range(n_generations)])
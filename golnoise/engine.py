@@ -0,0 +1,240 @@
+# Batched version of update(cells, noise) from Convolve3.0.py
+# cells has shape (n_trials, rows, cols) and every trial advances together
+# backend='numba' runs the fused kernel in _compiled.py, backend='numpy' is always available,
+# backend='bitslice' packs 64 trials per machine word (bitslice.py)
+#
+# The stepping loop ping-pongs between two preallocated state buffers and writes every
+# intermediate through out= parameters, so after make_scratch() it allocates nothing
+#
+# States are uint8 and counts int8 (a noised count lies in -1..9), so each full-size
+# buffer is 1 byte per cell instead of the 8 the float64 grids in the scripts use
+#
+# Trials below sparse_noise_below do not draw their noise cell by cell: noise_events picks
+# the noisy cells with geometric skips and only those are touched (two draws per noisy
+# cell, so about one number per 500 cells at noise = 0.001); the decision is per trial, so
+# a batch mixing low and high noise levels still samples its low ones sparsely
+#
+# noise may also be one value per trial (any array of length n_trials), so a whole noise
+# sweep advances as one batch; broadcast_batch builds such batches from parameter axes
+
+import numpy as np
+from scipy.ndimage import convolve
+
+from golnoise import _compiled
+
+# Same neighborhood as the scripts, with a leading axis of length 1 so trials never mix
+kernel = np.array([[[1, 1, 1],
+                    [1, 0, 1],
+                    [1, 1, 1]]], dtype=np.uint8)
+
+state_dtype = np.uint8
+count_dtype = np.int8
+
+backends = ('numpy', 'numba', 'bitslice')
+
+# Noise levels below this are sampled as sparse events, at or above it cell by cell
+sparse_noise_below = 0.04  # measured break-even of the two samplers on 100 x 64 x 64 batches
+
+# Noise-free runs on dead-edged boards go through hashlife.run_batch instead of stepping
+hashlife_when_noise_free = True
+
+
+def resolve_backend(backend='auto'):
+    """Pick the backend to use, falling back to numpy when numba is missing."""
+    if backend == 'auto':
+        return 'numba' if _compiled.available else 'numpy'
+    if backend not in backends:
+        raise ValueError(f"unknown backend {backend!r}, expected one of {backends}")
+    if backend == 'numba' and not _compiled.available:
+        raise ImportError("backend 'numba' requested but numba is not installed")
+    return backend
+
+
+def neighbor_count(cells, boundary='constant', out=None):
+    """Count the live Moore neighbors of every cell in a batch."""
+    return convolve(cells, kernel, output=out, mode=boundary, cval=0)
+
+
+def population(cells):
+    """Exact number of live cells in each trial of a batch."""
+    return cells.sum(axis=(-2, -1), dtype=np.int64)
+
+
+def per_trial(value, ndim=3):
+    """value unchanged if scalar, else reshaped to (n_trials, 1, 1) to broadcast over a batch."""
+    value = np.asarray(value)
+    if value.ndim == 0:
+        return value.item()
+    return value.reshape((-1,) + (1,) * (ndim - 1))
+
+
+def broadcast_batch(cells, **parameters):
+    """Repeat a batch for every combination of the given parameter values.
+
+    Returns (batch, per-trial parameters): with cells of n_trials trials and parameters
+    noise=[0, 0.1] and weight=[0.5, 0.8, 1.0], batch holds 6 * n_trials trials, combination
+    by combination, and every parameter becomes an array with one value per trial.
+    """
+    grids = np.meshgrid(*[np.asarray(values) for values in parameters.values()], indexing='ij')
+    n_combinations = grids[0].size if grids else 1
+    batch = np.tile(cells, (n_combinations,) + (1,) * (cells.ndim - 1))
+    return batch, {name: np.repeat(grid.ravel(), len(cells)) for name, grid in zip(parameters, grids)}
+
+
+def noise_events(shape, noise, rng):
+    """Flat indices and +/-1 steps of the noisy counts of a batch.
+
+    Every cell is noisy with its trial's probability noise, independently; the noisy cells
+    are found by geometric skips through the trials sharing a noise level, so the cost is
+    proportional to the number of events rather than to the number of cells.
+    """
+    n_trials = shape[0]
+    size = int(np.prod(shape[1:]))
+    noise = np.broadcast_to(np.asarray(noise, dtype=np.float64).ravel(), n_trials)
+    indices = []
+    for level in np.unique(noise[noise > 0]):
+        trials = np.flatnonzero(noise == level)
+        n_cells = len(trials) * size
+        expected = n_cells * level
+        positions = np.cumsum(rng.geometric(level, int(expected + 5 * np.sqrt(expected)) + 1)) - 1
+        while positions[-1] < n_cells:
+            more = np.cumsum(rng.geometric(level, int(expected) // 8 + 16))
+            positions = np.concatenate([positions, positions[-1] + more])
+        positions = positions[positions < n_cells]
+        indices.append(trials[positions // size] * size + positions % size)
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+    steps = rng.integers(0, 2, len(indices), dtype=count_dtype) * 2 - 1
+    return indices, steps.astype(count_dtype)
+
+
+def dense_trials(noise, n_trials):
+    """(start, stop) runs of trials whose noise is at or above sparse_noise_below."""
+    dense = np.broadcast_to(np.ravel(np.asarray(noise) >= sparse_noise_below), n_trials).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], dense, [0]])))
+    return edges.reshape(-1, 2)
+
+
+def count_noise(shape, noise, rng, dtype=np.int64):
+    """+/-1 with probability noise (half each way), 0 otherwise, as a full array.
+
+    Trials below sparse_noise_below get sparse events, the others a draw per cell.
+    """
+    noise = per_trial(noise, len(shape))
+    out = np.zeros(shape, dtype=dtype)
+    indices, steps = noise_events(shape, np.where(noise < sparse_noise_below, noise, 0), rng)
+    out[np.unravel_index(indices, shape)] = steps
+    trial_noise = np.broadcast_to(noise, (shape[0],) + (1,) * (len(shape) - 1))
+    for start, stop in dense_trials(noise, shape[0]):
+        uniform = rng.random((stop - start,) + tuple(shape[1:]))
+        level = trial_noise[start:stop]
+        out[start:stop] = (uniform < level).astype(dtype) - 2 * (uniform < level / 2)
+    return out
+
+
+def make_scratch(shape, dtype=state_dtype, backend='auto', rng=None):
+    """Allocate everything step_into needs for batches of this shape."""
+    backend = resolve_backend(backend)
+    rng = np.random.default_rng(rng)  # a Generator, a seed or None
+
+    scratch = {"backend": backend, "rng": rng, "state": np.zeros(shape, dtype=dtype)}
+    if backend == 'numpy':
+        scratch["alive"] = np.empty(shape, dtype=count_dtype)
+        scratch["uniform"] = np.empty(shape, dtype=np.float32)
+        scratch["mask"] = np.empty(shape, dtype=bool)
+        scratch["other_mask"] = np.empty(shape, dtype=bool)
+    elif backend == 'numba':
+        # numba keeps its own per-thread generators, statistically equivalent to the numpy
+        # path but not bit-identical; tie the calling thread's stream to rng
+        _compiled.seed(int(rng.integers(2 ** 31)))
+    return scratch
+
+
+def step_into(src, dst, scratch, noise, boundary='constant'):
+    """Write the generation after src into dst using only the buffers in scratch."""
+    if scratch["backend"] == 'numba':
+        noise = np.ascontiguousarray(np.broadcast_to(np.asarray(noise, dtype=np.float64).ravel(), len(src)))
+        _compiled.step_trials(src, dst, noise, boundary == 'wrap', sparse_noise_below)
+        return dst
+    if scratch["backend"] == 'bitslice':
+        # Packs and unpacks around every call; run() keeps the batch packed throughout
+        from golnoise import bitslice
+        digits = bitslice.noise_digits(noise, len(src))
+        words = bitslice.step(bitslice.pack(src), digits, scratch["rng"], boundary)
+        dst[...] = bitslice.unpack(words, len(src))
+        return dst
+
+    alive = scratch["alive"]
+    mask = scratch["mask"]
+    other_mask = scratch["other_mask"]
+
+    neighbor_count(src, boundary, out=alive)
+
+    # "noise" modification: u < noise/2 takes one away, noise/2 <= u < noise adds one
+    # (no clip needed: a count of -1 decides the same way as 0)
+    # Trials below sparse_noise_below only get their noise events scattered in, the others
+    # are drawn cell by cell, run by run of consecutive trials
+    noise = per_trial(noise, src.ndim)
+    if np.any((noise > 0) & (noise < sparse_noise_below)):
+        indices, steps = noise_events(src.shape, np.where(noise < sparse_noise_below, noise, 0), scratch["rng"])
+        alive[np.unravel_index(indices, src.shape)] += steps
+    trial_noise = np.broadcast_to(noise, (len(src),) + (1,) * (src.ndim - 1))
+    for start, stop in dense_trials(noise, len(src)):
+        level = trial_noise[start:stop]
+        run_alive, run_mask = alive[start:stop], mask[start:stop]
+        uniform = scratch["rng"].random(dtype=np.float32, out=scratch["uniform"][start:stop])
+        np.less(uniform, level, out=run_mask)
+        np.add(run_alive, run_mask, out=run_alive)
+        np.less(uniform, level * 0.5, out=run_mask)
+        np.subtract(run_alive, run_mask, out=run_alive)
+        np.subtract(run_alive, run_mask, out=run_alive)
+
+    # Born with exactly 3, survive with 2 or 3
+    np.equal(alive, 2, out=other_mask)
+    np.logical_and(other_mask, src, out=other_mask)
+    np.equal(alive, 3, out=mask)
+    np.logical_or(mask, other_mask, out=mask)
+    np.copyto(dst, mask, casting='unsafe')
+    return dst
+
+
+def update(cells, noise, rng=None, boundary='constant'):
+    """One noisy generation for a batch, returned as a new array."""
+    scratch = make_scratch(cells.shape, cells.dtype, backend='numpy', rng=rng)
+    return step_into(cells, scratch["state"], scratch, noise, boundary)
+
+
+def run(cells, noise, n_generations, backend='auto', rng=None, boundary='constant', scratch=None,
+        recorder=None, use_hashlife=None):
+    """Advance a batch n_generations times in place and return the buffer holding the result.
+
+    cells is used as one of the two ping-pong buffers, so its contents are overwritten;
+    the result is either cells itself or scratch["state"]. A TrajectoryRecorder passed as
+    recorder sees the seed as generation 0 and every generation after it.
+
+    noise is a scalar or one value per trial. With noise exactly 0 on a 'constant' boundary
+    and no recorder, the batch is handed to HashLife (pass use_hashlife=False, or clear
+    hashlife_when_noise_free, to always step).
+    """
+    if use_hashlife is None:
+        use_hashlife = hashlife_when_noise_free
+    if use_hashlife and np.all(np.asarray(noise) == 0) and boundary == 'constant' and recorder is None:
+        from golnoise import hashlife
+        cells[...] = hashlife.run_batch(cells, n_generations)
+        return cells
+
+    if scratch is None:
+        scratch = make_scratch(cells.shape, cells.dtype, backend, rng)
+    if scratch["backend"] == 'bitslice':
+        from golnoise import bitslice
+        cells[...] = bitslice.run(cells, noise, n_generations, scratch["rng"], boundary, recorder)
+        return cells
+
+    src, dst = cells, scratch["state"]
+    if recorder is not None:
+        recorder.record(0, src)
+    for generation in range(1, n_generations + 1):
+        step_into(src, dst, scratch, noise, boundary)
+        src, dst = dst, src
+        if recorder is not None:
+            recorder.record(generation, src)
+    return src
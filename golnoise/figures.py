@@ -0,0 +1,180 @@
+# Figure set for a sweep, rendered from a SweepStore instead of re-simulating
+# Run from the repository root with: python3 -m golnoise.figures [store_path] [output_folder]
+#
+# Every figure is a job (kind, filename, data). Jobs render in a process pool on the
+# non-interactive Agg backend, and <output_folder>/cache.json remembers a hash of each
+# figure's data, so after a new sweep only figures whose data changed are redrawn.
+
+import os
+import sys
+import json
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from golnoise.store import SweepStore
+
+cache_name = "cache.json"
+highlight = 10  # patterns in the most tolerant and lowest/highest SD figures
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_combination(plt, data, filename):
+    noise, mean, std_dev, pattern = data["noise"], data["mean"], data["std_dev"], data["pattern"]
+    plt.figure(figsize=(10, 6))
+    plt.plot(noise, mean, label=f"Combination {pattern}")
+    plt.fill_between(noise, mean - std_dev, mean + std_dev, alpha=0.3, label="Std Dev")
+    plt.xlabel('Noise Level')
+    plt.ylabel('Mean Final Population')
+    plt.title(f'Combination {pattern}')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(filename)
+    plt.close()
+
+
+def plot_combinations(plt, data, filename):
+    plt.figure(figsize=(10, 6))
+    for pattern, mean in zip(data["patterns"], data["means"]):
+        plt.plot(data["noise"], mean, linewidth=0.8, label=f"Combination {pattern}" if data["legend"] else None)
+    plt.xlabel('Noise Level')
+    plt.ylabel('Mean Final Population')
+    plt.title(data["title"])
+    if data["legend"]:
+        plt.legend(fontsize='small')
+    plt.grid(True)
+    plt.savefig(filename)
+    plt.close()
+
+
+def plot_trajectory(plt, data, filename):
+    generations, mean, std_dev = data["generations"], data["mean"], data["std_dev"]
+    plt.figure(figsize=(10, 6))
+    plt.plot(generations, mean, label=f"Noise Level: {data['noise']:.2f}")
+    plt.fill_between(generations, np.maximum(mean - std_dev, 0), mean + std_dev, alpha=0.3)
+    plt.xlabel('Generation')
+    plt.ylabel('Population')
+    plt.title(f"Average Population Over Time (Noise Level {data['noise']:.2f}), all combinations")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(filename)
+    plt.close()
+
+
+plotters = {
+    "combination": plot_combination,
+    "combinations": plot_combinations,
+    "trajectory": plot_trajectory,
+}
+
+
+def sweep_jobs(store):
+    """(kind, filename, data) for every figure a sweep store supports."""
+    noise = store.noise_levels
+    stats = np.asarray(store.stats)
+    done = store.completed().all(axis=0)
+    patterns = np.flatnonzero(done)
+    jobs = []
+
+    for pattern in patterns:
+        jobs.append(("combination", f"combination_{pattern}.png",
+                     {"noise": noise, "mean": stats[:, pattern, 0], "std_dev": stats[:, pattern, 1],
+                      "pattern": int(pattern)}))
+
+    means = stats[:, patterns, 0].T
+    jobs.append(("combinations", "all_combinations.png",
+                 {"noise": noise, "patterns": patterns, "means": means, "legend": False,
+                  "title": "Mean Final Population, All Combinations"}))
+
+    # Most tolerant: largest mean population summed over noise levels
+    tolerant = patterns[np.argsort(-means.sum(axis=1), kind='stable')[:highlight]]
+    jobs.append(("combinations", "most_tolerant_patterns.png",
+                 {"noise": noise, "patterns": tolerant, "means": stats[:, tolerant, 0].T, "legend": True,
+                  "title": f"{highlight} Most Tolerant Patterns"}))
+
+    # Lowest and highest average std dev among patterns that are not always empty
+    alive = patterns[means.max(axis=1) > 0]
+    average_sd = stats[:, alive, 1].mean(axis=0)
+    order = alive[np.argsort(average_sd, kind='stable')]
+    for name, chosen in (("lowest_sd", order[:highlight]), ("highest_sd", order[::-1][:highlight])):
+        jobs.append(("combinations", f"{name}_patterns.png",
+                     {"noise": noise, "patterns": chosen, "means": stats[:, chosen, 0].T, "legend": True,
+                      "title": f"{highlight} {name.replace('_', ' ').title()} Patterns"}))
+
+    # Population over time per noise level, when the sweep recorded trajectories
+    if store.trajectories is not None and store.meta.get("record_every"):
+        generations = np.arange(0, store.meta["n_generations"] + 1, store.meta["record_every"])
+        for noise_index, noise_level in enumerate(noise):
+            if not store.completed()[noise_index].all():
+                continue
+            trajectories = np.asarray(store.trajectories[noise_index], dtype=np.float64)
+            if store.meta["record_mode"] == 'stats':
+                per_pattern = trajectories[:, 0]
+            else:
+                per_pattern = trajectories.mean(axis=1)
+            jobs.append(("trajectory", f"noise_level_{noise_level:.2f}.png",
+                         {"generations": generations, "mean": per_pattern.mean(axis=0),
+                          "std_dev": per_pattern.std(axis=0), "noise": float(noise_level)}))
+    return jobs
+
+
+def data_hash(kind, data):
+    """Hash of a job's kind and data, stable across runs."""
+    digest = hashlib.sha1(kind.encode())
+    for key in sorted(data):
+        digest.update(key.encode())
+        digest.update(np.ascontiguousarray(data[key]).tobytes())
+    return digest.hexdigest()
+
+
+def render(job):
+    kind, filename, data = job
+    plotters[kind](_pyplot(), data, filename)
+    return filename
+
+
+def render_all(jobs, folder, max_workers=None):
+    """Render the jobs whose data changed since the last call; return the files drawn."""
+    os.makedirs(folder, exist_ok=True)
+    cache_path = os.path.join(folder, cache_name)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as file:
+            cache = json.load(file)
+
+    stale, hashes = [], {}
+    for kind, filename, data in jobs:
+        hashes[filename] = data_hash(kind, data)
+        if cache.get(filename) != hashes[filename] or not os.path.exists(os.path.join(folder, filename)):
+            stale.append((kind, os.path.join(folder, filename), data))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=max_workers or multiprocessing.cpu_count()) as executor:
+            drawn = list(executor.map(render, stale, chunksize=4))
+    else:
+        drawn = []
+
+    cache.update(hashes)
+    with open(cache_path, 'w') as file:
+        json.dump(cache, file, indent=2)
+    return drawn
+
+
+def main():
+    store_path = sys.argv[1] if len(sys.argv) > 1 else 'sweep_results'
+    folder = sys.argv[2] if len(sys.argv) > 2 else 'figures'
+    jobs = sweep_jobs(SweepStore(store_path, mode='r'))
+    drawn = render_all(jobs, folder)
+    print(f"{len(drawn)} of {len(jobs)} figures redrawn in {folder}")
+
+
+if __name__ == '__main__':
+    main()
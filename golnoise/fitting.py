@@ -0,0 +1,149 @@
+# Refit the noise-correction models of the Regression scripts from simulated data
+# Regression1.0.py and Regression2.0.py hardcode coefficients fitted elsewhere; here the
+# training tuples (cell state, true count, noised count, neighbors' noised-count sum) come
+# straight from batched soups like the scripts' (random_percent_pop alive on a wrapped
+# 60x80 board), sampled every generation while the soups evolve under the noise
+# Run from the repository root with: python3 -m golnoise.fitting [noise ...]
+#
+# Samples are never kept: each generation only adds to per-(state, noised count) sums of
+# 1, s, s^2, y, s*y and y^2 (s the neighbors' sum, y the true count). Any piecewise model
+# over noised-count ranges is a least-squares fit built from those sums, so the number of
+# samples is limited only by time. Output is regression_pieces.json, one table per noise
+# level in the rules.regression2_pieces layout, ready for rules.regression(..., pieces)
+
+import json
+import sys
+import time
+
+import numpy as np
+
+from golnoise import engine, rules
+
+n_trials = 100
+n_batches = 10
+n_generations = 250
+shape = (60, 80)
+random_percent_pop = 0.25
+boundary = 'wrap'
+backend = 'auto'
+output_path = 'regression_pieces.json'
+
+# Same ranges as Regression2.0.py, and one piece over every count like Regression1.0.py
+# (whose model uses the noised count alone) and Regression1Modified.py (which adds the
+# neighbors' sum, rules.regression1_pieces)
+piece_ranges = tuple((low, high) for low, high, *_ in rules.regression2_pieces)
+single_range = ((-1, 9),)
+
+counts = np.arange(-1, 10)  # every possible noised count
+moment_names = ("n", "s", "ss", "y", "sy", "yy")
+
+
+class Moments:
+    """Sufficient statistics per (cell state, noised count); a recorder for engine.run."""
+
+    def __init__(self, noise, rng=None):
+        self.noise = noise
+        self.rng = np.random.default_rng(rng)
+        self.sums = np.zeros((2, len(counts), len(moment_names)))
+
+    def reset(self):
+        pass
+
+    def record(self, generation, cells):
+        true = engine.neighbor_count(cells, boundary).astype(np.int16)
+        noised = true + engine.count_noise(cells.shape, self.noise, self.rng, np.int16)
+        neighbors = engine.neighbor_count(noised, boundary).astype(np.float64)
+        self.add(cells, true, noised, neighbors)
+
+    def add(self, cells, true, noised, neighbors):
+        """Add tuples given as equally shaped arrays."""
+        group = (cells.astype(np.intp) * len(counts) + noised - counts[0]).ravel()
+        y = true.ravel().astype(np.float64)
+        s = neighbors.ravel()
+        size = self.sums.shape[0] * self.sums.shape[1]
+        for index, weights in enumerate((None, s, s * s, y, s * y, y * y)):
+            self.sums[..., index] += np.bincount(group, weights, minlength=size).reshape(self.sums.shape[:2])
+
+
+def simulate(noise, n_batches=None, rng=None):
+    """Moments of n_batches batches of n_trials soups evolved for n_generations."""
+    n_batches = globals()['n_batches'] if n_batches is None else n_batches
+    rng = np.random.default_rng(rng)
+    moments = Moments(noise, rng)
+    for _ in range(n_batches):
+        cells = (rng.random((n_trials,) + shape, dtype=np.float32) < random_percent_pop).astype(engine.state_dtype)
+        engine.run(cells, noise, n_generations, backend=backend, rng=rng, boundary=boundary, recorder=moments)
+    return moments
+
+
+def fit_piece(sums, low, high, neighbors=True):
+    """(intercept, noised count coefficient, neighbors' sum coefficient, samples) of one piece.
+
+    neighbors=False fits the noised count alone, leaving the neighbors' coefficient 0.
+
+    sums is (noised count, moment) already summed over the states wanted. A piece that
+    covers a single noised count cannot tell its coefficient from the intercept, so it
+    gets 0 there, as in Regression2.0.py.
+    """
+    rows = (counts >= low) & (counts <= high)
+    c = counts[rows].astype(np.float64)
+    n, s, ss, y, sy, yy = sums[rows].T
+    total = n.sum()
+    if total == 0:
+        return (np.nan, np.nan, np.nan, 0)
+
+    # Normal equations for the features (1, noised, s)
+    xtx = np.array([[total, (c * n).sum(), s.sum()],
+                    [(c * n).sum(), (c * c * n).sum(), (c * s).sum()],
+                    [s.sum(), (c * s).sum(), ss.sum()]])
+    xty = np.array([y.sum(), (c * y).sum(), sy.sum()])
+    used = [0, 2] if low == high else [0, 1, 2]
+    if not neighbors:
+        used = used[:-1] if low != high else [0]
+    beta = np.zeros(3)
+    beta[used] = np.linalg.lstsq(xtx[np.ix_(used, used)], xty[used], rcond=None)[0]
+    return (float(beta[0]), float(beta[1]), float(beta[2]), int(total))
+
+
+def fit(moments, ranges=piece_ranges, state=None, neighbors=True):
+    """Coefficient table [(low, high, intercept, own, neighbors)] from moments.
+
+    state=None pools dead and live cells; 0 or 1 fits only cells in that state.
+    neighbors=False drops the neighbors' sum from the features.
+    """
+    sums = moments.sums.sum(axis=0) if state is None else moments.sums[state]
+    return [(low, high) + fit_piece(sums, low, high, neighbors)[:3] for low, high in ranges]
+
+
+def load_pieces(noise, path=output_path):
+    """The table fitted for the stored noise level closest to noise."""
+    with open(path) as file:
+        tables = json.load(file)
+    closest = min(tables, key=lambda level: abs(float(level) - noise))
+    return [tuple(piece) for piece in tables[closest]["regression2"]]
+
+
+def main():
+    noise_levels = [float(arg) for arg in sys.argv[1:]] or [0.1, 0.5, 0.9]
+    start_time = time.time()
+
+    tables = {}
+    for noise in noise_levels:
+        moments = simulate(noise, rng=[20240423, round(noise * 1e9)])
+        tables[str(noise)] = {"regression1": fit(moments, single_range, neighbors=False),
+                              "regression1_modified": fit(moments, single_range),
+                              "regression2": fit(moments, piece_ranges),
+                              "samples": int(moments.sums[..., 0].sum())}
+        print(f"noise {noise}: {tables[str(noise)]['samples']} samples")
+        for piece in tables[str(noise)]["regression2"]:
+            print("   ", piece)
+
+    with open(output_path, 'w') as file:
+        json.dump(tables, file, indent=2)
+
+    end_time = time.time()
+    print(f"Time taken to run the function: {end_time - start_time} seconds")
+
+
+if __name__ == '__main__':
+    main()
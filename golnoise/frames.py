@@ -0,0 +1,192 @@
+# Streaming frame export with random access to any generation
+# Replaces keeping a history list of np.copy(cells) snapshots in memory: every frame is
+# appended to <path>.frames as it is produced and read back through a memmap
+#
+# Each frame is stored either as a keyframe (the whole grid, bit-packed when the grid only
+# holds 0/1) or as a delta against the previous frame (flat indices of the cells that
+# changed, plus their new values for non-binary grids), whichever is smaller, and the
+# encoded bytes are zlib-compressed. A keyframe is forced every keyframe_every frames, so
+# seeking to generation N decodes at most keyframe_every frames.
+# <path>.index.npy holds one (offset, length, kind) row per frame, <path>.json the shape
+# and encoding.
+
+import json
+import zlib
+
+import numpy as np
+
+KEYFRAME = 0
+DELTA = 1
+
+
+class FrameStore:
+    """Append-only, seekable sequence of equally shaped grids on disk."""
+
+    def __init__(self, path, shape=None, dtype=np.uint8, binary=True, keyframe_every=64,
+                 compression=1, mode='r'):
+        self.path = path
+        self.frames_path = path + ".frames"
+        self.index_path = path + ".index.npy"
+        self.meta_path = path + ".json"
+        self.mode = mode
+        self._map = None
+        self._cache = None  # (generation, frame) of the last decoded frame
+
+        if mode == 'w':
+            if shape is None:
+                raise ValueError("shape is required when creating a frame store")
+            self.shape = tuple(shape)
+            self.dtype = np.dtype(dtype)
+            self.binary = binary
+            self.keyframe_every = keyframe_every
+            self.compression = compression
+            self._index = []
+            self._file = open(self.frames_path, 'wb')
+            self._previous = None
+        else:
+            with open(self.meta_path) as file:
+                meta = json.load(file)
+            self.shape = tuple(meta["shape"])
+            self.dtype = np.dtype(meta["dtype"])
+            self.binary = meta["binary"]
+            self.keyframe_every = meta["keyframe_every"]
+            self._index = [tuple(int(n) for n in row) for row in np.load(self.index_path)]
+            self._file = None
+
+    def __len__(self):
+        return len(self._index)
+
+    # Writing
+
+    def append(self, frame):
+        """Encode frame as the next generation."""
+        frame = np.asarray(frame)
+        if frame.shape != self.shape:
+            raise ValueError(f"frame has shape {frame.shape}, store holds {self.shape}")
+        if self.binary:
+            # Boards may be float (the scripts' np.zeros grids); packbits wants integers or bools
+            frame = frame != 0
+
+        key_bytes = np.packbits(frame.ravel()) if self.binary else frame.astype(self.dtype).ravel()
+        kind, payload = KEYFRAME, key_bytes.tobytes()
+
+        if self._previous is not None and len(self._index) % self.keyframe_every:
+            changed = np.flatnonzero(frame.ravel() != self._previous.ravel()).astype(np.uint32)
+            delta = changed.tobytes()
+            if not self.binary:
+                delta += frame.ravel()[changed].astype(self.dtype).tobytes()
+            if len(delta) < len(payload):
+                kind, payload = DELTA, delta
+
+        payload = zlib.compress(payload, self.compression)
+        offset = self._file.tell()
+        self._file.write(payload)
+        self._index.append((offset, len(payload), kind))
+        self._previous = np.array(frame, dtype=self.dtype)
+
+    def truncate(self, n_frames):
+        """Drop every frame from generation n_frames on, so new frames replace them."""
+        if n_frames >= len(self._index):
+            return
+        end = self._index[n_frames][0]
+        del self._index[n_frames:]
+        self._file.seek(end)
+        self._file.truncate()
+        self._map = None
+        self._cache = None
+        self._previous = self.frame(n_frames - 1) if n_frames else None
+
+    def flush(self):
+        if self._file is None:
+            return
+        self._file.flush()
+        self._map = None
+        np.save(self.index_path, np.array(self._index, dtype=np.int64).reshape(-1, 3))
+        with open(self.meta_path, 'w') as file:
+            json.dump({"shape": list(self.shape), "dtype": self.dtype.str, "binary": self.binary,
+                       "keyframe_every": self.keyframe_every}, file)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Reading
+
+    def _payload(self, generation):
+        offset, length, kind = self._index[generation]
+        if self._file is not None:
+            self._file.flush()
+        if self._map is None or self._map.size < offset + length:
+            self._map = np.memmap(self.frames_path, dtype=np.uint8, mode='r')
+        return kind, zlib.decompress(self._map[offset:offset + length])
+
+    def _decode_key(self, data):
+        if self.binary:
+            bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=int(np.prod(self.shape)))
+            return bits.astype(self.dtype).reshape(self.shape)
+        return np.frombuffer(data, dtype=self.dtype).reshape(self.shape).copy()
+
+    def _apply_delta(self, frame, data):
+        flat = frame.reshape(-1)
+        if self.binary:
+            changed = np.frombuffer(data, dtype=np.uint32)
+            flat[changed] ^= 1
+        else:
+            n_changed = len(data) // (4 + self.dtype.itemsize)
+            changed = np.frombuffer(data, dtype=np.uint32, count=n_changed)
+            flat[changed] = np.frombuffer(data, dtype=self.dtype, offset=4 * n_changed)
+        return frame
+
+    def frame(self, generation):
+        """Decode the grid at generation, seeking from the nearest keyframe."""
+        if generation < 0:
+            generation += len(self._index)
+        if not 0 <= generation < len(self._index):
+            raise IndexError(f"generation {generation} out of range for {len(self._index)} frames")
+
+        # Continue from the last decoded frame when scrubbing forward
+        if self._cache is not None and self._cache[0] <= generation and \
+                generation - self._cache[0] < self.keyframe_every:
+            start, frame = self._cache[0], self._cache[1].copy()
+        else:
+            start = generation
+            while self._index[start][2] != KEYFRAME:
+                start -= 1
+            frame = self._decode_key(self._payload(start)[1])
+
+        for g in range(start + 1, generation + 1):
+            kind, data = self._payload(g)
+            frame = self._decode_key(data) if kind == KEYFRAME else self._apply_delta(frame, data)
+
+        self._cache = (generation, frame.copy())
+        return frame
+
+    def __getitem__(self, generation):
+        return self.frame(generation)
+
+    def __iter__(self):
+        for generation in range(len(self._index)):
+            yield self.frame(generation)
+
+
+def export(update, cells, n_generations, path, *args, binary=True, keyframe_every=64, **kwargs):
+    """Stream cells and n_generations of update(cells, *args, **kwargs) into a FrameStore.
+
+    update is any of the rule functions that take the grid first and return the next
+    grid, e.g. the update(cells, noise) of Convolve3.0.py or the regression variants.
+    """
+    with FrameStore(path, cells.shape, dtype=np.uint8 if binary else cells.dtype, binary=binary,
+                    keyframe_every=keyframe_every, mode='w') as store:
+        store.append(cells)
+        for _ in range(n_generations):
+            cells = update(cells, *args, **kwargs)
+            store.append(cells)
+    return FrameStore(path)
@@ -0,0 +1,205 @@
+# HashLife for noise-free B3/S23 on the fixed boards the sweeps use
+# Quadtree nodes are hash-consed through join(), and successor() memoizes the result of
+# advancing a node's centre by 2**j generations, so repeated structure is stepped once
+# Both caches are LRU-bounded (max_nodes, max_results) to keep memory flat on long runs
+#
+# HashLife evolves an unbounded plane, but the boards here treat everything off the edge
+# as dead. A jump of T generations is only taken while the live cells are at least T
+# cells from every edge (nothing can travel faster than one cell per generation), and
+# stretches where the pattern touches the edge are stepped densely instead. Every board
+# reached is remembered with its generation; once one comes back the run has entered a
+# cycle of the difference in generations, and the rest is skipped modulo that period.
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+max_nodes = 2 ** 22
+max_results = 2 ** 20
+dense_chunk = 64  # generations stepped densely when the pattern touches the edge
+
+_mask = (1 << 63) - 1
+
+
+class Node(namedtuple("Node", ["k", "a", "b", "c", "d", "n", "hash"])):
+    """2**k x 2**k square: a b / c d quadrants, n live cells."""
+    __slots__ = ()
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return self is other or tuple.__eq__(self, other)
+
+
+on = Node(0, None, None, None, None, 1, 1)
+off = Node(0, None, None, None, None, 0, 0)
+
+
+@lru_cache(maxsize=max_nodes)
+def join(a, b, c, d):
+    """The canonical node with quadrants a, b, c, d."""
+    n = a.n + b.n + c.n + d.n
+    node_hash = (a.k + 2 + 5131830419411 * a.hash + 3758991985019 * b.hash +
+                 8973110871315 * c.hash + 4318490180473 * d.hash) & _mask
+    return Node(a.k + 1, a, b, c, d, n, node_hash)
+
+
+@lru_cache(maxsize=64)
+def empty(k):
+    return off if k == 0 else join(empty(k - 1), empty(k - 1), empty(k - 1), empty(k - 1))
+
+
+def centre(m):
+    """Level k+1 node with m in its middle."""
+    z = empty(m.k - 1)
+    return join(join(z, z, z, m.a), join(z, z, m.b, z),
+                join(z, m.c, z, z), join(m.d, z, z, z))
+
+
+def _life(a, b, c, d, e, f, g, h, i):
+    outer = a.n + b.n + c.n + d.n + f.n + g.n + h.n + i.n
+    return on if outer == 3 or (e.n and outer == 2) else off
+
+
+def _life_4x4(m):
+    ad = _life(m.a.a, m.a.b, m.b.a, m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a)
+    bc = _life(m.a.b, m.b.a, m.b.b, m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b)
+    cb = _life(m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a, m.c.c, m.c.d, m.d.c)
+    da = _life(m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b, m.c.d, m.d.c, m.d.d)
+    return join(ad, bc, cb, da)
+
+
+@lru_cache(maxsize=max_results)
+def successor(m, j):
+    """Centre of m (level k-1) advanced by 2**j generations, j <= k-2."""
+    if m.n == 0:
+        return m.a
+    if m.k == 2:
+        return _life_4x4(m)
+
+    c1 = successor(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+    c2 = successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+    c3 = successor(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+    c4 = successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+    c5 = successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+    c6 = successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+    c7 = successor(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+    c8 = successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+    c9 = successor(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+
+    if j < m.k - 2:
+        # The nine results already cover 2**j generations, just take their centres
+        return join(join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+    return join(successor(join(c1, c2, c4, c5), j), successor(join(c2, c3, c5, c6), j),
+                successor(join(c4, c5, c7, c8), j), successor(join(c5, c6, c8, c9), j))
+
+
+def from_array(cells, k):
+    """Level k node with cells in its top-left corner."""
+    if not cells.any():
+        return empty(k)
+    if k == 0:
+        return on
+    half = 1 << (k - 1)
+    return join(from_array(cells[:half, :half], k - 1), from_array(cells[:half, half:], k - 1),
+                from_array(cells[half:, :half], k - 1), from_array(cells[half:, half:], k - 1))
+
+
+def to_array(node, out, row=0, col=0):
+    """Paint the live cells of node, top-left at (row, col), into out (clipped to out)."""
+    if node.n == 0 or row >= out.shape[0] or col >= out.shape[1]:
+        return out
+    size = 1 << node.k
+    if row + size <= 0 or col + size <= 0:
+        return out
+    if node.k == 0:
+        out[row, col] = 1
+        return out
+    half = size >> 1
+    to_array(node.a, out, row, col)
+    to_array(node.b, out, row, col + half)
+    to_array(node.c, out, row + half, col)
+    to_array(node.d, out, row + half, col + half)
+    return out
+
+
+def advance(cells, j):
+    """Board after 2**j generations on the unbounded plane, cropped back to cells.shape."""
+    rows, cols = cells.shape
+    k = max(2, int(np.ceil(np.log2(max(rows, cols)))))
+    # Centre the board so successor's result (the middle half) covers all of it, and keep
+    # padding until the node is large enough for a 2**j jump
+    node = centre(from_array(cells, k))
+    origin = -(1 << (k - 1))
+    while node.k < j + 2:
+        origin -= 1 << (node.k - 1)
+        node = centre(node)
+    origin += 1 << (node.k - 2)
+    node = successor(node, j)
+    return to_array(node, np.zeros(cells.shape, dtype=np.uint8), origin, origin)
+
+
+def edge_margin(cells):
+    """Distance from the live cells to the nearest edge, or None for an empty board."""
+    live_rows = np.flatnonzero(cells.any(axis=1))
+    if len(live_rows) == 0:
+        return None
+    live_cols = np.flatnonzero(cells.any(axis=0))
+    rows, cols = cells.shape
+    return min(live_rows[0], live_cols[0], rows - 1 - live_rows[-1], cols - 1 - live_cols[-1])
+
+
+def _dense(cells, n_generations):
+    from golnoise import engine
+    batch = np.array(cells[None], dtype=np.uint8)
+    return engine.run(batch, 0, n_generations, backend='numpy', use_hashlife=False)[0].copy()
+
+
+def run(cells, n_generations):
+    """Noise-free B3/S23 on a dead-edged board, n_generations later."""
+    cells = np.asarray(cells, dtype=np.uint8)
+    remaining = n_generations
+    seen = {cells.tobytes(): 0}
+    while remaining:
+        margin = edge_margin(cells)
+        if margin is None:
+            return cells
+
+        if margin >= 1:
+            j = min(int(margin).bit_length(), remaining.bit_length()) - 1
+            step = 1 << j
+            new_cells = advance(cells, j)
+        else:
+            step = min(dense_chunk, remaining)
+            new_cells = _dense(cells, step)
+
+        remaining -= step
+        cells = new_cells
+        generation = n_generations - remaining
+        key = cells.tobytes()
+        if key in seen:
+            # Deterministic, so the board repeats every `period` generations from here on
+            remaining %= generation - seen[key]
+            seen.clear()
+        seen[key] = generation
+    return cells
+
+
+def run_batch(cells, n_generations):
+    """run() over each board of a (trial, row, col) batch, once per distinct seed."""
+    out = np.empty(cells.shape, dtype=np.uint8)
+    if np.array_equal(cells, np.broadcast_to(cells[:1], cells.shape)):
+        out[:] = run(cells[0], n_generations)
+        return out
+    for trial in range(len(cells)):
+        out[trial] = run(cells[trial], n_generations)
+    return out
+
+
+def clear_cache():
+    join.cache_clear()
+    successor.cache_clear()
+    empty.cache_clear()
@@ -0,0 +1,109 @@
+# "Larger than Life": the noisy rule of engine.update with a radius-r neighborhood
+# cells has shape (n_trials, rows, cols) like the batches in engine.py
+#
+# Counts come from integral images (2-D cumulative sums), so each cell costs four lookups
+# whatever the radius and a radius-10 run costs about the same as radius 1; convolving
+# with a (2r+1)x(2r+1) kernel would grow with r^2
+#
+# A von Neumann diamond |dr| + |dc| <= r is a square after rotating the board 45 degrees
+# (u = row + col, v = row - col), so it uses the same box sum on the rotated board
+#
+# The center cell is never counted, as in the repo's 3x3 kernel. Birth and survival are
+# inclusive (low, high) count intervals; the defaults with radius 1 are B3/S23. Noise moves
+# the count by +/-count_step, each with probability noise/2
+
+import numpy as np
+
+from golnoise import engine
+
+radius = 1
+neighborhood = 'moore'
+birth_interval = (3, 3)
+survival_interval = (2, 3)
+count_step = 1
+
+neighborhoods = ('moore', 'von_neumann')
+
+
+def integral_image(cells):
+    """Summed-area table with a leading row and column of zeros."""
+    rows, cols = cells.shape[-2:]
+    table = np.zeros(cells.shape[:-2] + (rows + 1, cols + 1), dtype=np.int32)
+    np.cumsum(cells, axis=-2, dtype=np.int32, out=table[..., 1:, 1:])
+    np.cumsum(table[..., 1:, 1:], axis=-1, out=table[..., 1:, 1:])
+    return table
+
+
+def box_sum(padded, r):
+    """Sum over every (2r+1)x(2r+1) window of a board already padded by r on each side."""
+    table = integral_image(padded)
+    size = 2 * r + 1
+    rows, cols = padded.shape[-2] - 2 * r, padded.shape[-1] - 2 * r
+    return (table[..., size:size + rows, size:size + cols] - table[..., :rows, size:size + cols]
+            - table[..., size:size + rows, :cols] + table[..., :rows, :cols])
+
+
+def _pad(cells, r, boundary):
+    pad = [(0, 0)] * (cells.ndim - 2) + [(r, r), (r, r)]
+    if boundary == 'wrap':
+        return np.pad(cells, pad, mode='wrap')
+    return np.pad(cells, pad)
+
+
+def _diamond_sum(padded, r):
+    """Sum over |dr| + |dc| <= r around every interior cell of a board padded by r."""
+    rows, cols = padded.shape[-2:]
+    i, j = np.indices((rows, cols))
+    u, v = i + j, i - j + cols - 1
+
+    # Rotated board, with r more zeros around it so every box fits
+    rotated = np.zeros(padded.shape[:-2] + (rows + cols - 1 + 2 * r,) * 2, dtype=padded.dtype)
+    rotated[..., u + r, v + r] = padded
+    sums = box_sum(rotated, r)
+
+    inner = (slice(r, rows - r), slice(r, cols - r))
+    return sums[..., u[inner], v[inner]]
+
+
+def neighbor_count(cells, r=None, kind=None, boundary='constant'):
+    """Live cells within radius r of every cell, not counting the cell itself."""
+    r = radius if r is None else r
+    kind = neighborhood if kind is None else kind
+    if kind not in neighborhoods:
+        raise ValueError(f"unknown neighborhood {kind!r}, expected one of {neighborhoods}")
+
+    padded = _pad(cells, r, boundary)
+    counts = box_sum(padded, r) if kind == 'moore' else _diamond_sum(padded, r)
+    return counts - cells
+
+
+def update(cells, noise, rng=None, boundary='constant', r=None, kind=None, birth=None, survival=None,
+           step=None):
+    """One noisy generation for a batch, returned as a new array."""
+    if rng is None:
+        rng = np.random.default_rng()
+    birth = birth_interval if birth is None else birth
+    survival = survival_interval if survival is None else survival
+    step = count_step if step is None else step
+
+    alive = neighbor_count(cells, r, kind, boundary)
+
+    # Same noise as engine.step_into, scaled to +/-step
+    if np.any(engine.per_trial(noise, cells.ndim) > 0):
+        alive += step * engine.count_noise(alive.shape, noise, rng, np.int32)
+
+    born = (alive >= birth[0]) & (alive <= birth[1])
+    survives = (alive >= survival[0]) & (alive <= survival[1])
+    return np.where(cells == 1, survives, born).astype(cells.dtype)
+
+
+def run(cells, noise, n_generations, rng=None, boundary='constant', recorder=None, **rule):
+    """Advance a batch n_generations times and return the result; rule takes update's keywords."""
+    rng = np.random.default_rng(rng)
+    if recorder is not None:
+        recorder.record(0, cells)
+    for generation in range(1, n_generations + 1):
+        cells = update(cells, noise, rng, boundary, **rule)
+        if recorder is not None:
+            recorder.record(generation, cells)
+    return cells
@@ -0,0 +1,129 @@
+# Exact solver for the noisy rule on tiny boards (up to 16 cells, 65,536 states)
+# Graphing/Noise_Neighbors.py samples n_trials runs of a 3x3 board; here the board state
+# is a Markov chain, so the whole distribution over states is pushed forward instead
+#
+# Given the board, every cell flips its own noise coin, so the next state is a product of
+# independent per-cell Bernoullis. Cells whose noised count cannot land on 2 or 3 are
+# deterministic, so each row of the transition matrix only has 2**(uncertain cells)
+# entries. States are numbered like binary_matrix_to_decimal: the top-left cell is the
+# most significant bit, so on a 3x3 board the state index is the combination number.
+
+import numpy as np
+from scipy import sparse
+
+max_cells = 16
+
+
+def state_index(cells):
+    """Integer state of a 0/1 board, top-left cell as the most significant bit."""
+    flat = np.asarray(cells, dtype=np.int64).ravel()
+    return int(flat @ (1 << np.arange(flat.size - 1, -1, -1)))
+
+
+def state_bits(shape):
+    """(state, cell) array of every board of this shape."""
+    n_cells = shape[0] * shape[1]
+    shifts = np.arange(n_cells - 1, -1, -1)
+    states = np.arange(2 ** n_cells, dtype=np.int64)
+    return ((states[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+def adjacency(shape, boundary='constant'):
+    """(cell, cell) 0/1 matrix of Moore neighbors."""
+    rows, cols = shape
+    matrix = np.zeros((rows * cols, rows * cols), dtype=np.uint8)
+    for row, col in np.ndindex(shape):
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                if i == 0 and j == 0:
+                    continue
+                neighbor_row, neighbor_col = row + i, col + j
+                if boundary == 'wrap':
+                    neighbor_row %= rows
+                    neighbor_col %= cols
+                elif not (0 <= neighbor_row < rows and 0 <= neighbor_col < cols):
+                    continue
+                matrix[row * cols + col, neighbor_row * cols + neighbor_col] = 1
+    return matrix
+
+
+def alive_probability(noise):
+    """(state, true count) table of the chance a cell is alive next generation."""
+    table = np.zeros((2, 9))
+    for state in (0, 1):
+        for count in range(9):
+            # Noised count is count-1, count or count+1, clipped to [0, 8]
+            for noised, weight in ((count - 1, noise / 2), (count, 1 - noise), (count + 1, noise / 2)):
+                noised = min(max(noised, 0), 8)
+                if noised == 3 or (state == 1 and noised == 2):
+                    table[state, count] += weight
+    return table
+
+
+def _transition_rows(probability, n_cells, tol):
+    """Sparse rows for a block of states, given their per-cell alive probabilities."""
+    # Grow every row one cell at a time: certain cells just set their bit, uncertain
+    # cells split each partial transition in two
+    source = np.arange(len(probability), dtype=np.int64)
+    target = np.zeros(len(probability), dtype=np.int64)
+    weight = np.ones(len(probability))
+    for cell in range(n_cells):
+        bit = 1 << (n_cells - 1 - cell)
+        q = probability[source, cell]
+        target[q == 1] += bit
+
+        split = (q > 0) & (q < 1)
+        born_source, born_target = source[split], target[split] + bit
+        born_weight = weight[split] * q[split]
+        weight[split] *= 1 - q[split]
+
+        source = np.concatenate([source, born_source])
+        target = np.concatenate([target, born_target])
+        weight = np.concatenate([weight, born_weight])
+        if tol > 0:
+            keep = weight >= tol
+            source, target, weight = source[keep], target[keep], weight[keep]
+
+    return sparse.csr_matrix((weight, (source, target)), shape=(len(probability), 2 ** n_cells))
+
+
+def transition_matrix(shape, noise, boundary='constant', tol=0.0, block_size=4096):
+    """Sparse (state, next state) matrix of the noisy rule on a board of this shape.
+
+    Rows with k uncertain cells hold 2**k entries: about 1e5 in total on a 3x3 board,
+    4e6 on 3x4 and 5e8 (several GB) on 4x4. tol > 0 drops transitions less likely than
+    tol, which keeps 4x4 small at low noise but is then no longer exact.
+    """
+    n_cells = shape[0] * shape[1]
+    if n_cells > max_cells:
+        raise ValueError(f"{shape} has {n_cells} cells, the exact solver handles at most {max_cells}")
+
+    bits = state_bits(shape)
+    counts = bits.astype(np.int64) @ adjacency(shape, boundary).T
+    probability = alive_probability(noise)[bits, counts]
+
+    # Built in blocks of rows so only one block's triplets are in memory at a time
+    blocks = [_transition_rows(probability[start:start + block_size], n_cells, tol)
+              for start in range(0, len(bits), block_size)]
+    return sparse.vstack(blocks, format='csr')
+
+
+def propagate(matrix, initial_states, n_generations):
+    """(seed, state) distribution after n_generations, one row per initial state."""
+    distribution = np.zeros((matrix.shape[0], len(initial_states)))
+    distribution[initial_states, np.arange(len(initial_states))] = 1
+    # Columns are distributions, so each generation is one sparse product with the transpose
+    forward = matrix.T.tocsr()
+    for _ in range(n_generations):
+        distribution = forward @ distribution
+    return distribution.T
+
+
+def population_moments(shape, noise, initial_states, n_generations, boundary='constant'):
+    """Exact mean and variance of the final population for each initial state."""
+    matrix = transition_matrix(shape, noise, boundary)
+    distribution = propagate(matrix, np.asarray(initial_states), n_generations)
+    population = state_bits(shape).sum(axis=1, dtype=np.int64)
+    mean = distribution @ population
+    variance = distribution @ population ** 2 - mean ** 2
+    return mean, np.maximum(variance, 0)
@@ -0,0 +1,109 @@
+# Mean-field and pair approximations of the density of a random soup under noise
+# Uses the same per-cell rule as update(cells, noise): the true neighbor count is moved
+# by +/-1 with probability noise, then B3/S23 decides (markov.alive_probability)
+#
+# Mean field treats all 8 neighbors as independent with the current density.
+# The pair approximation also tracks q = P(neighbor alive | cell alive), assumes the
+# neighbors of a cell are independent given that cell's state, and updates q from the
+# 3x4 block around two adjacent cells. One pair statistic is shared by all 8 directions.
+
+import numpy as np
+from scipy.stats import binom
+
+from golnoise import engine
+from golnoise.markov import alive_probability
+from golnoise.trajectory import TrajectoryRecorder
+
+
+def next_density(density, noise):
+    """Mean-field density one generation after density."""
+    table = alive_probability(noise)
+    counts = binom.pmf(np.arange(9), 8, density)
+    return (1 - density) * counts @ table[0] + density * counts @ table[1]
+
+
+def mean_field(density, noise, n_generations):
+    """Densities at generations 0..n_generations under the mean-field map."""
+    densities = np.empty(n_generations + 1)
+    densities[0] = density
+    for generation in range(n_generations):
+        densities[generation + 1] = next_density(densities[generation], noise)
+    return densities
+
+
+# 3x4 block around the adjacent pair at (1, 1) and (1, 2). Its probability is built along
+# a spanning tree of Moore-adjacent cells: the top row left to right, then every other
+# cell from the one above it.
+_block_rows, _block_cols = 3, 4
+_configs = ((np.arange(2 ** 12)[:, None] >> np.arange(11, -1, -1)) & 1).reshape(-1, 3, 4)
+_parents = [None, (0, 0), (0, 1), (0, 2)] + [(row - 1, col) for row in (1, 2) for col in range(4)]
+
+
+def _neighbor_count(configs, row, col):
+    window = configs[:, row - 1:row + 2, col - 1:col + 2]
+    return window.sum(axis=(1, 2)) - configs[:, row, col]
+
+
+_count_a = _neighbor_count(_configs, 1, 1)
+_count_b = _neighbor_count(_configs, 1, 2)
+
+
+def next_pair(density, q, noise):
+    """Pair-approximation (density, q) one generation later."""
+    if density <= 0:
+        return 0.0, 0.0
+    if density >= 1:
+        density = 1.0
+    # P(neighbor alive | cell dead) follows from the density and q
+    q_dead = density * (1 - q) / (1 - density) if density < 1 else 0.0
+    conditional = np.array([q_dead, q])
+
+    flat = _configs.reshape(len(_configs), -1)
+    probability = np.where(flat[:, 0] == 1, density, 1 - density)
+    for cell, parent in enumerate(_parents):
+        if parent is None:
+            continue
+        parent_state = flat[:, parent[0] * _block_cols + parent[1]]
+        alive = conditional[parent_state]
+        probability = probability * np.where(flat[:, cell] == 1, alive, 1 - alive)
+
+    table = alive_probability(noise)
+    alive_a = table[_configs[:, 1, 1], _count_a]
+    alive_b = table[_configs[:, 1, 2], _count_b]
+    new_density = probability @ alive_a
+    both_alive = probability @ (alive_a * alive_b)
+    new_q = both_alive / new_density if new_density > 0 else 0.0
+    return float(new_density), float(new_q)
+
+
+def pair_approximation(density, noise, n_generations, q=None):
+    """Densities at generations 0..n_generations; q defaults to an uncorrelated soup."""
+    q = density if q is None else q
+    densities = np.empty(n_generations + 1)
+    densities[0] = density
+    for generation in range(n_generations):
+        density, q = next_pair(density, q, noise)
+        densities[generation + 1] = density
+    return densities
+
+
+def monte_carlo(density, noise, n_generations, shape=(60, 80), n_trials=10, rng=None):
+    """Mean density of n_trials random soups on a wrapped board, for comparison."""
+    rng = np.random.default_rng(rng)
+    cells = (rng.random((n_trials,) + shape) < density).astype(engine.state_dtype)
+    recorder = TrajectoryRecorder(n_trials, n_generations, mode='stats')
+    engine.run(cells, noise, n_generations, rng=rng, boundary='wrap', recorder=recorder)
+    return recorder.result(0)[0] / (shape[0] * shape[1])
+
+
+def compare(density, noise_levels, n_generations, **monte_carlo_args):
+    """Largest gap between each approximation and simulation, per noise level.
+
+    Noise levels where both gaps are small are ones the approximation can stand in for.
+    """
+    gaps = {"mean_field": [], "pair": []}
+    for noise in noise_levels:
+        simulated = monte_carlo(density, noise, n_generations, **monte_carlo_args)
+        gaps["mean_field"].append(np.max(np.abs(mean_field(density, noise, n_generations) - simulated)))
+        gaps["pair"].append(np.max(np.abs(pair_approximation(density, noise, n_generations) - simulated)))
+    return {name: np.array(values) for name, values in gaps.items()}
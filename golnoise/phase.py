@@ -0,0 +1,103 @@
+# Phase diagram of random soups over initial density x noise
+# NoiseMain.py watches one (random_percent_pop, noise_probability) pair at a time; here
+# every point runs n_trials soups as one batch on the same wrapped 60x80 board, and the
+# (density, noise) square is refined adaptively where soups go from dying out to surviving
+# Run from the repository root with: python3 -m golnoise.phase
+#
+# The square starts as a coarse grid of cells. Each round, cells whose corners disagree
+# about survival (some below survival_threshold, some above) are split into four, and
+# only the new corner points are simulated. Output is phase_diagram.npz with one row per
+# simulated point: density, noise, survival fraction and mean final density.
+
+import time
+
+import numpy as np
+from scipy.interpolate import griddata
+
+from golnoise import engine, pool
+
+n_trials = 32
+n_generations = 256
+shape = (60, 80)
+boundary = 'wrap'
+backend = 'auto'
+entropy = 20240423
+
+initial_divisions = 4  # coarse grid of 4x4 cells, 5x5 points
+max_depth = 4  # each coarse cell can be split 4 times, down to 1/64 of the square
+survival_threshold = 0.5  # fraction of surviving trials that marks the boundary
+output_path = 'phase_diagram.npz'
+
+
+def simulate_point(point):
+    """Survival fraction and mean final density of n_trials soups at (density, noise)."""
+    density, noise = point
+    # Each point gets its own stream, so re-running a point reproduces it
+    rng = np.random.default_rng([entropy, round(density * 1e9), round(noise * 1e9)])
+    cells = (rng.random((n_trials,) + shape, dtype=np.float32) < density).astype(engine.state_dtype)
+    cells = engine.run(cells, noise, n_generations, backend=backend, rng=rng, boundary=boundary)
+    population = engine.population(cells)
+    return np.mean(population > 0), np.mean(population) / (shape[0] * shape[1])
+
+
+def simulate_points(points):
+    if engine.resolve_backend(backend) == 'numba':
+        return list(map(simulate_point, points))
+    settings = {name: globals()[name] for name in ("n_trials", "n_generations", "shape", "boundary", "backend", "entropy")}
+    executor = pool.shared_pool(settings={simulate_point.__module__: settings})
+    return list(executor.map(simulate_point, points))
+
+
+def refine(cells, results):
+    """Split the cells whose corners straddle survival_threshold; return the new cells."""
+    split = []
+    for x0, y0, size, depth in cells:
+        corners = [results[(x0, y0)], results[(x0 + size, y0)],
+                   results[(x0, y0 + size)], results[(x0 + size, y0 + size)]]
+        survived = [corner[0] >= survival_threshold for corner in corners]
+        if depth < max_depth and any(survived) and not all(survived):
+            half = size / 2
+            split += [(x0, y0, half, depth + 1), (x0 + half, y0, half, depth + 1),
+                      (x0, y0 + half, half, depth + 1), (x0 + half, y0 + half, half, depth + 1)]
+    return split
+
+
+def phase_diagram():
+    """Adaptively sampled (points, survival, final density) over [0, 1] x [0, 1]."""
+    size = 1.0 / initial_divisions
+    cells = [(i * size, j * size, size, 0) for i in range(initial_divisions) for j in range(initial_divisions)]
+    results = {}
+
+    round_number = 0
+    while cells:
+        corners = {(x0 + dx, y0 + dy) for x0, y0, size, _ in cells for dx in (0, size) for dy in (0, size)}
+        new_points = sorted(point for point in corners if point not in results)
+        results.update(zip(new_points, simulate_points(new_points)))
+        print(f"Round {round_number}: {len(new_points)} points simulated, {len(results)} in total")
+        cells = refine(cells, results)
+        round_number += 1
+
+    points = np.array(sorted(results))
+    values = np.array([results[tuple(point)] for point in points])
+    return points, values[:, 0], values[:, 1]
+
+
+def surface(points, values, resolution=101):
+    """values interpolated onto a regular (noise, density) grid for plotting."""
+    axis = np.linspace(0, 1, resolution)
+    density, noise = np.meshgrid(axis, axis)
+    return density, noise, griddata(points, values, (density, noise), method='linear')
+
+
+def main():
+    start_time = time.time()
+    points, survival, final_density = phase_diagram()
+    np.savez(output_path, density=points[:, 0], noise=points[:, 1], survival=survival,
+             final_density=final_density)
+    end_time = time.time()
+    print(f"Time taken to run the function: {end_time - start_time} seconds")
+
+
+if __name__ == '__main__':
+    from golnoise.phase import main
+    main()
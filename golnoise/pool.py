@@ -0,0 +1,65 @@
+# Process pools whose workers start in milliseconds
+# Workers come from a forkserver: a clean server process that imports the engine and the
+# sweep modules once (numpy, scipy, the compiled kernels' module) and forks every worker
+# from itself, so a worker finds them already imported and does not inherit the parent's
+# threads, which is what makes forking after a numba run unsafe. Under python3 -m a worker
+# still runs the entry module's top level as __mp_main__ (multiprocessing does that for
+# every start method), so entry modules keep it to imports and constants and call main()
+# from their real module name
+#
+# Starting a forkserver pool costs a few tenths of a second, so callers that map work
+# repeatedly (the surrogate's rounds, phase's refinement rounds) share one through shared_pool
+#
+# Forkserver workers do not see module globals the parent changed at run time (for
+# example sweep.n_trials = 20), so make_pool copies the ones passed as settings into each
+# worker before it takes any work
+
+import atexit
+import importlib
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+preload = ['golnoise.engine', 'golnoise.store', 'golnoise.trajectory', 'golnoise.census',
+           'golnoise.telemetry', 'golnoise.sweep']
+
+_shared = {}
+
+
+def _configure(settings):
+    for name, values in settings.items():
+        module = sys.modules.get(name) or importlib.import_module(name)
+        vars(module).update(values)
+
+
+def make_pool(max_workers=None, settings=None):
+    """ProcessPoolExecutor on a preloaded forkserver where the platform has one.
+
+    settings maps module names to {global: value} to set in every worker; use the
+    worker function's __module__.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(preload)
+    else:
+        context = multiprocessing.get_context()
+    return ProcessPoolExecutor(max_workers=max_workers or multiprocessing.cpu_count(), mp_context=context,
+                               initializer=_configure, initargs=(settings or {},))
+
+
+def shared_pool(max_workers=None, settings=None):
+    """A make_pool pool kept open across calls; replaced when the arguments change."""
+    key = repr((max_workers, settings))
+    if _shared.get("key") != key:
+        shutdown()
+        _shared.update(key=key, executor=make_pool(max_workers, settings))
+    return _shared["executor"]
+
+
+@atexit.register
+def shutdown():
+    """Close the shared pool, if there is one."""
+    executor = _shared.pop("executor", None)
+    _shared.pop("key", None)
+    if executor is not None:
+        executor.shutdown()
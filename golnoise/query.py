@@ -0,0 +1,201 @@
+# In-memory query layer over a finished sweep
+# Loads a SweepStore (or an output1.csv) into a dense (pattern, noise, stat) tensor and
+# precomputes per-noise rankings and per-pattern survival crossings, so questions like
+# "10 most tolerant patterns" or "highest tolerated noise per combination" are answered
+# from indexes instead of re-reading the CSV
+#
+# Run from the repository root with, for example:
+#   python3 -m golnoise.query sweep_results top 10 --stat mean
+#   python3 -m golnoise.query sweep_results tolerance --top 10
+#   python3 -m golnoise.query csvs/output1.csv threshold --stat cv --above 1 --noise 0.05
+
+import argparse
+import csv
+import warnings
+
+import numpy as np
+
+from golnoise.store import SweepStore, stat_names
+
+
+class Results:
+    """Indexed (pattern, noise, stat) results of a sweep; missing cells are NaN."""
+
+    def __init__(self, noise_levels, tensor):
+        self.noise_levels = np.asarray(noise_levels, dtype=np.float64)
+        self.tensor = np.asarray(tensor, dtype=np.float64)
+        self.patterns = np.arange(self.tensor.shape[0])
+
+        # Over-noise average as an extra last "noise level" column for rankings
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # patterns with no completed cell
+            averaged = np.nanmean(self.tensor, axis=1)
+        self._ranked = np.concatenate([self.tensor, averaged[:, None]], axis=1)
+
+        # order[s, n] lists patterns by ascending stat s at noise n, NaN last; count[s, n] valid ones
+        values = np.moveaxis(self._ranked, 0, -1)  # (noise + 1, stat, pattern)
+        self.order = np.argsort(values, axis=-1, kind='stable').transpose(1, 0, 2)
+        self.sorted = np.take_along_axis(values.transpose(1, 0, 2), self.order, axis=-1)
+        self.count = (~np.isnan(self.sorted)).sum(axis=-1)
+
+        self._crossings = {}
+
+    @classmethod
+    def from_store(cls, path, emulated=False):
+        """Load a SweepStore; cells a surrogate sweep emulated are NaN unless emulated is set."""
+        store = SweepStore(path, mode='r')
+        stats = np.array(store.stats)
+        if not emulated:
+            stats[~store.simulated()] = np.nan
+        return cls(store.noise_levels, stats.transpose(1, 0, 2))
+
+    @classmethod
+    def from_csv(cls, filename):
+        """Load the output1.csv layout written by Convolve3.0.py and SweepStore.to_csv."""
+        with open(filename, newline='') as file:
+            rows = [row for row in csv.DictReader(file)]
+        noise_levels = sorted({float(row["Noise Level"]) for row in rows})
+        n_patterns = max(512, max(int(row["Combination"]) for row in rows) + 1)
+        tensor = np.full((n_patterns, len(noise_levels), len(stat_names)), np.nan)
+        columns = ("Mean", "Std Dev", "CV")
+        for row in rows:
+            noise_index = noise_levels.index(float(row["Noise Level"]))
+            tensor[int(row["Combination"]), noise_index] = [float(row[column]) for column in columns]
+        return cls(noise_levels, tensor)
+
+    @classmethod
+    def load(cls, path, emulated=False):
+        return cls.from_csv(path) if path.endswith(".csv") else cls.from_store(path, emulated)
+
+    def noise_index(self, noise):
+        """Column for noise: the closest stored level, or the over-noise average for None."""
+        if noise is None:
+            return len(self.noise_levels)
+        return int(np.argmin(np.abs(self.noise_levels - noise)))
+
+    def values(self, stat='mean', noise=None):
+        """stat of every pattern at noise, or averaged over noise."""
+        return self._ranked[:, self.noise_index(noise), stat_names.index(stat)]
+
+    def top(self, k=10, stat='mean', noise=None, largest=True):
+        """The k patterns with the largest (or smallest) stat at noise, or averaged over noise."""
+        s, n = stat_names.index(stat), self.noise_index(noise)
+        valid = self.order[s, n, :self.count[s, n]]
+        return valid[::-1][:k] if largest else valid[:k]
+
+    def threshold(self, stat='mean', above=None, below=None, noise=None):
+        """Patterns whose stat at noise is > above and/or < below, in ascending order of stat."""
+        s, n = stat_names.index(stat), self.noise_index(noise)
+        values = self.sorted[s, n, :self.count[s, n]]
+        start = 0 if above is None else np.searchsorted(values, above, side='right')
+        stop = len(values) if below is None else np.searchsorted(values, below, side='left')
+        return self.order[s, n, start:stop]
+
+    def percentile(self, q, stat='mean', noise=None):
+        """q-th percentile (linear interpolation, as np.percentile) of stat across patterns."""
+        s, n = stat_names.index(stat), self.noise_index(noise)
+        values = self.sorted[s, n, :self.count[s, n]]
+        position = q / 100 * (len(values) - 1)
+        low = int(np.floor(position))
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    def crossings(self, stat='mean', threshold=0.0):
+        """Per pattern, index of the last noise level, walking up from the lowest, before stat
+        first drops to <= threshold; -1 if it is already there at the lowest level.
+
+        Levels past the first drop are ignored: at high noise dead patterns come back to life.
+        """
+        key = (stat, threshold)
+        if key not in self._crossings:
+            exceeds = self.tensor[..., stat_names.index(stat)] > threshold
+            first_drop = np.where(exceeds.all(axis=1), exceeds.shape[1], np.argmin(exceeds, axis=1))
+            self._crossings[key] = first_drop - 1
+        return self._crossings[key]
+
+    def highest_tolerated(self, pattern=None, threshold=0.0):
+        """Highest noise level up to which the mean population stays above threshold (NaN if it
+        does not at the lowest level), the 'Highest Level of Toleration' column of
+        csvs/HighestLevelofToleration.csv (computed from csvs/100Trials.csv)."""
+        index = self.crossings('mean', threshold)
+        levels = np.where(index >= 0, self.noise_levels[index], np.nan)
+        return levels if pattern is None else levels[pattern]
+
+    def group_by(self, key='cells', stat='mean', noise=None, reduce=np.nanmean):
+        """Reduce stat at noise over groups of patterns.
+
+        key is 'cells' (live cells in the 3x3 pattern), 'class' (patterns equal under
+        rotation and reflection, labelled by their smallest member) or one label per pattern.
+        """
+        if isinstance(key, str):
+            if key == 'cells':
+                labels = np.array([bin(pattern).count("1") for pattern in self.patterns])
+            elif key == 'class':
+                from golnoise.surrogate import pattern_classes
+                labels = np.empty(len(self.patterns), dtype=int)
+                for representative, members in pattern_classes().items():
+                    labels[members] = representative
+            else:
+                raise ValueError(f"unknown group key {key!r}, expected 'cells', 'class' or labels")
+        else:
+            labels = np.asarray(key)
+        values = self.values(stat, noise)
+        return {label.item(): reduce(values[labels == label]) for label in np.unique(labels)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m golnoise.query")
+    parser.add_argument("path", help="sweep store directory or output1.csv")
+    parser.add_argument("--emulated", action="store_true",
+                        help="include the cells a surrogate sweep emulated instead of simulating")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    top = commands.add_parser("top", help="patterns with the largest or smallest stat")
+    top.add_argument("k", type=int, nargs="?", default=10)
+    top.add_argument("--smallest", action="store_true")
+
+    threshold = commands.add_parser("threshold", help="patterns with the stat in a range")
+    threshold.add_argument("--above", type=float)
+    threshold.add_argument("--below", type=float)
+
+    percentile = commands.add_parser("percentile", help="percentile of the stat across patterns")
+    percentile.add_argument("q", type=float)
+
+    tolerance = commands.add_parser("tolerance", help="highest noise level with a surviving mean")
+    tolerance.add_argument("--threshold", type=float, default=0.0)
+    tolerance.add_argument("--top", type=int)
+
+    group = commands.add_parser("group", help="stat averaged over groups of patterns")
+    group.add_argument("key", choices=("cells", "class"))
+
+    for command in (top, threshold, percentile, group):
+        command.add_argument("--stat", choices=stat_names, default="mean")
+        command.add_argument("--noise", type=float, help="noise level (default: average over all)")
+
+    args = parser.parse_args(argv)
+    results = Results.load(args.path, args.emulated)
+
+    if args.command == "top":
+        for pattern in results.top(args.k, args.stat, args.noise, largest=not args.smallest):
+            print(pattern, results.values(args.stat, args.noise)[pattern])
+    elif args.command == "threshold":
+        print(" ".join(map(str, results.threshold(args.stat, args.above, args.below, args.noise))))
+    elif args.command == "percentile":
+        print(results.percentile(args.q, args.stat, args.noise))
+    elif args.command == "tolerance":
+        levels = results.highest_tolerated(threshold=args.threshold)
+        order = np.argsort(-np.nan_to_num(levels, nan=-np.inf), kind='stable')
+        print("Combination,Highest Level of Toleration,Mean,Std Dev")
+        for pattern in order[:args.top]:
+            if np.isnan(levels[pattern]):
+                print(f"{pattern},N/A,N/A,N/A")
+            else:
+                mean, std_dev = results.tensor[pattern, results.noise_index(levels[pattern]), :2]
+                print(f"{pattern},{levels[pattern]:g},{mean:g},{std_dev:g}")
+    elif args.command == "group":
+        for label, value in results.group_by(args.key, args.stat, args.noise).items():
+            print(label, value)
+
+
+if __name__ == '__main__':
+    main()
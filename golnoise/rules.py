@@ -0,0 +1,107 @@
+# The update rules of the experiment scripts, batched and free of GUI imports
+# Graphs/NoiseMainModified.py, Regression1Modified.py and Regression2Modified.py import
+# pygame at the top just to define update(); the versions here compute the same thing on
+# (trial, row, col) batches (a single 2-D board works too) and take an rng
+#
+#   noise_main    NoiseMainModified.py: +/-1 count noise with probability noise, B3/S23
+#   regression1   Regression1Modified.py: guess the true count from the noised count and
+#                 the sum of the neighbors' noised counts with one linear model
+#   regression2   Regression2Modified.py: the same with a piecewise model per noised count
+#   bsd           Graphing/NoisewithBSD2.0.py: B3/S23 plus random births and deaths
+#   wisdom        VisualizingNoise/WisdomoftheCrowd.py: weighted own and neighbors' counts
+#
+# Each keeps its script's boundary as the default: wrapped for the Graphs rules, dead
+# edges for the others. noise, the BSD probabilities and the crowd weights may be one
+# value per trial (see engine.broadcast_batch), so a parameter grid runs as one batch
+
+import numpy as np
+
+from golnoise import engine
+
+wisdom_weights = (0.8, 0.2)  # weight_1, weight_2 in WisdomoftheCrowd.py
+
+
+def _count(cells, boundary):
+    """Moore neighbor sum of a batch or a single board, in the dtype of cells."""
+    batch = cells.reshape((-1,) + cells.shape[-2:])
+    return engine.neighbor_count(batch, boundary).reshape(cells.shape)
+
+
+def _count_noise(shape, noise, rng):
+    """+/-1 with probability noise, 0 otherwise (apply_noise in the scripts)."""
+    return engine.count_noise(shape, noise, rng)
+
+
+def _life(cells, count):
+    return ((count == 3) | ((count == 2) & (cells == 1))).astype(cells.dtype)
+
+
+def noise_main(cells, noise, rng=None, boundary='wrap'):
+    rng = np.random.default_rng(rng)
+    return _life(cells, _count(cells.astype(np.int64), boundary) + _count_noise(cells.shape, noise, rng))
+
+
+# Regression models as pieces (lowest noised count, highest, intercept, noised count
+# coefficient, neighbors' noised-count sum coefficient); noised counts outside every piece
+# (-1, 8, 9 for Regression2) guess 0, as in the scripts. fitting.py refits these tables
+regression1_pieces = (
+    (-1, 9, -0.236028491845496, 0.406401047839722, 0.078265356869915),
+)
+
+regression2_pieces = (
+    (0, 0, -3.97457252811653E-02, 0.0, 2.63517962151024E-02),
+    (1, 1, -0.194932201455905, 0.0, 8.75308708573203E-02),
+    (2, 2, 1.02854754427366, 0.0, 5.61051757908324E-02),
+    (3, 5, -0.258180864139362, 0.787647654473264, 3.29954507970766E-02),
+    (6, 7, -1.79207022505006, 1.07037822552138, 2.18569577000118E-02),
+)
+
+
+def regression(cells, noise, pieces, rng=None, boundary='wrap'):
+    """Life on the true count guessed from the noised counts by a piecewise linear model."""
+    rng = np.random.default_rng(rng)
+    noised = _count(cells.astype(np.int64), boundary) + _count_noise(cells.shape, noise, rng)
+    neighbors_noised = _count(noised, boundary)
+    guess = np.zeros(cells.shape)
+    for low, high, intercept, own, neighbors in pieces:
+        piece = (noised >= low) & (noised <= high)
+        guess[piece] = intercept + own * noised[piece] + neighbors * neighbors_noised[piece]
+    return _life(cells, np.round(np.clip(guess, 0, 8)))
+
+
+def regression1(cells, noise, rng=None, boundary='wrap', pieces=regression1_pieces):
+    return regression(cells, noise, pieces, rng, boundary)
+
+
+def regression2(cells, noise, rng=None, boundary='wrap', pieces=regression2_pieces):
+    return regression(cells, noise, pieces, rng, boundary)
+
+
+def bsd(cells, birth_prob, death_prob, rng=None, boundary='constant'):
+    """B3/S23 where a dead cell is also born with birth_prob and a live one dies with death_prob.
+
+    NoisewithBSD2.0.py also sets a survival_prob, but it is only consulted after a cell
+    has already been found to survive, so it never changes the outcome and is left out.
+    """
+    rng = np.random.default_rng(rng)
+    birth_prob, death_prob = engine.per_trial(birth_prob, cells.ndim), engine.per_trial(death_prob, cells.ndim)
+    count = _count(cells, boundary)
+    uniform = rng.random(cells.shape)
+    born = (count == 3) | (uniform < birth_prob)
+    survives = (count >= 2) & (count <= 3) & (uniform >= death_prob)
+    return np.where(cells == 1, survives, born).astype(cells.dtype)
+
+
+def wisdom(cells, noise, rng=None, boundary='constant', weights=None):
+    rng = np.random.default_rng(rng)
+    weight_1, weight_2 = (engine.per_trial(weight, cells.ndim)
+                          for weight in (wisdom_weights if weights is None else weights))
+    alive = np.clip(_count(cells.astype(np.int64), boundary) + _count_noise(cells.shape, noise, rng), 0, None)
+    mean_neighbors_alive = _count(alive, boundary) / 8.0
+    modified_cell_count = ((weight_1 * alive) ** 2 + weight_2 * mean_neighbors_alive) ** 0.5
+    survives = (modified_cell_count >= 2) & (modified_cell_count <= 3)
+    return np.where(cells == 1, survives, modified_cell_count == 3).astype(cells.dtype)
+
+
+rules = {"noise_main": noise_main, "regression1": regression1, "regression2": regression2,
+         "bsd": bsd, "wisdom": wisdom}
@@ -0,0 +1,83 @@
+# Library of initial configurations, replacing the pickled list in initial_configurations.npy
+# A library at <path> is described by <path>.json and comes in two kinds:
+#   packed  every configuration bit-packed along its rows in <path>.bits.npy, 1 bit per cell
+#   recipe  nothing stored but (entropy, density, shape, count); configuration i is drawn
+#           from SeedSequence(entropy, spawn_key=(i,)), so any one can be rebuilt on demand
+# SeedLibrary reads either kind through a memmap and fills engine batches in place.
+
+import json
+
+import numpy as np
+
+state_dtype = np.uint8
+
+
+def write_packed(path, configs):
+    """Store configs, a (config, rows, cols) 0/1 array, bit-packed."""
+    configs = np.asarray(configs)
+    np.save(path + ".bits.npy", np.packbits(configs.astype(bool), axis=-1))
+    with open(path + ".json", 'w') as file:
+        json.dump({"kind": "packed", "count": len(configs), "shape": list(configs.shape[1:])}, file)
+    return SeedLibrary(path)
+
+
+def write_recipe(path, count, shape, density, entropy=None):
+    """Describe count random soups of the given density; entropy=None picks a fresh one."""
+    entropy = np.random.SeedSequence(entropy).entropy
+    with open(path + ".json", 'w') as file:
+        json.dump({"kind": "recipe", "count": count, "shape": list(shape), "density": density,
+                   "entropy": str(entropy)}, file)
+    return SeedLibrary(path)
+
+
+class SeedLibrary:
+    """Random-access, batched reader for a seed library."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path + ".json") as file:
+            self.meta = json.load(file)
+        self.kind = self.meta["kind"]
+        self.shape = tuple(self.meta["shape"])
+        if self.kind == 'packed':
+            self._bits = np.load(path + ".bits.npy", mmap_mode='r')
+        elif self.kind == 'recipe':
+            self.density = self.meta["density"]
+            self.entropy = int(self.meta["entropy"])
+        else:
+            raise ValueError(f"unknown seed library kind {self.kind!r}")
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def batch(self, start, stop, out=None):
+        """Configurations start..stop-1 as a (config, rows, cols) uint8 batch, into out if given."""
+        stop = min(stop, len(self))
+        if out is None:
+            out = np.empty((stop - start,) + self.shape, dtype=state_dtype)
+        else:
+            out = out[:stop - start]
+
+        if self.kind == 'packed':
+            out[:] = np.unpackbits(self._bits[start:stop], axis=-1, count=self.shape[-1])
+        else:
+            for row, index in enumerate(range(start, stop)):
+                rng = np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=(index,)))
+                np.less(rng.random(self.shape, dtype=np.float32), self.density, out=out[row], casting='unsafe')
+        return out
+
+    def batches(self, batch_size, out=None):
+        """Iterate over the library batch_size configurations at a time, reusing out."""
+        for start in range(0, len(self), batch_size):
+            yield self.batch(start, start + batch_size, out)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"seed {index} out of range for {len(self)} seeds")
+        return self.batch(index, index + 1)[0]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
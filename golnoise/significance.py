@@ -0,0 +1,212 @@
+# Chi-square tests and bootstrap confidence intervals for every cell of a stored sweep
+# csvs/493Chi-Square.xlsx tests one combination by hand: the std dev of its final
+# population at noise 0.01, 0.02 and 0.03 against an "Average" column, sum((O - E)^2 / E)
+# with 3 degrees of freedom. Here that test, and stricter ones on the per-trial
+# populations, run for all patterns at once
+# Run from the repository root with: python3 -m golnoise.significance [store_path]
+#
+#   mean_chi_square  the spreadsheet's test for every pattern, on any stat (std dev by
+#                    default) against the average over patterns at each noise level, or
+#                    against given expected values; degrees of freedom = number of noise
+#                    levels, as in the sheet
+#   goodness_of_fit  each (noise, pattern) population histogram against the histogram of
+#                    all patterns pooled at that noise level
+#   homogeneity      per pattern, whether its population histogram is the same at every
+#                    noise level (contingency table noise x bins)
+#   bootstrap        percentile intervals for mean and CV; every cell is resampled with one
+#                    shared (resample, trial) weight matrix, so a resampled mean is a matmul
+
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.stats import chi2
+
+from golnoise.store import SweepStore, stat_names
+
+n_bins = 10
+n_resamples = 1000
+confidence = 0.95
+epsilon = 1e-7  # added to the mean before dividing, as in sweep.process_combination
+
+
+def _p_values(statistic, dof):
+    # No degrees of freedom means nothing varied, which is never significant
+    with np.errstate(invalid='ignore'):
+        return np.where(dof > 0, chi2.sf(statistic, np.maximum(dof, 1)), 1.0)
+
+
+def histogram(values, edges):
+    """Counts of values (..., n) in bins given per leading index by edges (..., bins + 1)."""
+    bins = edges.shape[-1] - 1
+    lead = values.shape[:-1]
+    flat = values.reshape(-1, values.shape[-1])
+    inner = np.broadcast_to(edges, lead + edges.shape[-1:]).reshape(-1, bins + 1)[:, 1:-1]
+    # Bin of a value = how many inner edges it reaches; the outer edges only bound the range
+    index = (flat[:, :, None] >= inner[:, None, :]).sum(axis=-1)
+    index += np.arange(len(flat))[:, None] * bins
+    return np.bincount(index.ravel(), minlength=len(flat) * bins).reshape(lead + (bins,))
+
+
+def quantile_edges(values, n_bins=n_bins, axis=-1):
+    """n_bins + 1 edges at equal quantiles of values along axis."""
+    return np.moveaxis(np.quantile(values, np.linspace(0, 1, n_bins + 1), axis=axis), 0, -1)
+
+
+def mean_chi_square(stats, stat='std_dev', noise_indices=None, expected=None):
+    """The spreadsheet test for every pattern: (statistic, dof, p) over the chosen noise levels.
+
+    stats is (noise, pattern, 3) as in a SweepStore; NaN cells are left out. expected holds
+    one value per chosen noise level and defaults to the average of stat over patterns
+    (the sheet's own "Average" column, 18.2 / 11.06 / 7.23, is not an average over any CSV
+    here, so pass it to reproduce the sheet).
+    """
+    values = np.asarray(stats, dtype=np.float64)[..., stat_names.index(stat)]
+    if noise_indices is not None:
+        values = values[noise_indices]
+    if expected is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # noise levels with no cell
+            expected = np.nanmean(values, axis=1, keepdims=True)
+    else:
+        expected = np.asarray(expected, dtype=np.float64).reshape(-1, 1)
+    used = (expected > 0) & ~np.isnan(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(used, (values - expected) ** 2 / expected, 0.0)
+    statistic = terms.sum(axis=0)
+    dof = used.sum(axis=0)
+    return statistic, dof, _p_values(statistic, dof)
+
+
+def _simulated_only(populations, simulated):
+    # Populations as float with the cells that were not simulated set to NaN
+    values = np.asarray(populations, dtype=np.float64)
+    return values if simulated is None else np.where(np.asarray(simulated)[..., None], values, np.nan)
+
+
+def goodness_of_fit(populations, n_bins=n_bins, simulated=None):
+    """Chi-square of every (noise, pattern) histogram against its noise level's pooled histogram.
+
+    populations is (noise, pattern, trial); returns (statistic, dof, p), each (noise, pattern).
+    With a (noise, pattern) simulated mask only those cells are pooled and tested, the
+    others get NaN.
+    """
+    values = _simulated_only(populations, simulated)
+    n_noise, n_patterns, n_trials = values.shape
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # noise levels with nothing simulated
+        edges = np.moveaxis(np.nanquantile(values.reshape(n_noise, -1), np.linspace(0, 1, n_bins + 1), axis=-1), 0, -1)
+    observed = histogram(np.nan_to_num(values), np.nan_to_num(edges)[:, None, :])
+    if simulated is None:
+        simulated = np.ones((n_noise, n_patterns), dtype=bool)
+    observed = observed * np.asarray(simulated)[..., None]
+    n_pooled = np.asarray(simulated).sum(axis=1)[:, None, None]
+    expected = observed.sum(axis=1, keepdims=True) / np.maximum(n_pooled, 1)
+
+    used = expected > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(used, (observed - expected) ** 2 / expected, 0.0)
+    statistic = terms.sum(axis=-1)
+    dof = np.broadcast_to(used.sum(axis=-1) - 1, statistic.shape)
+    p = _p_values(statistic, dof)
+    return tuple(np.where(simulated, value, np.nan) for value in (statistic, dof, p))
+
+
+def contingency_chi_square(table):
+    """Chi-square homogeneity test of tables (..., rows, cols); empty rows and columns drop out."""
+    table = np.asarray(table, dtype=np.float64)
+    rows = table.sum(axis=-1, keepdims=True)
+    cols = table.sum(axis=-2, keepdims=True)
+    total = table.sum(axis=(-2, -1), keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = rows * cols / total
+        terms = np.where(expected > 0, (table - expected) ** 2 / expected, 0.0)
+    statistic = terms.sum(axis=(-2, -1))
+    dof = ((rows[..., 0] > 0).sum(axis=-1) - 1) * ((cols[..., 0, :] > 0).sum(axis=-1) - 1)
+    return statistic, np.maximum(dof, 0), _p_values(statistic, np.maximum(dof, 0))
+
+
+def homogeneity(populations, n_bins=n_bins, simulated=None):
+    """Per pattern, is the population histogram the same at every noise level? (statistic, dof, p).
+
+    With a (noise, pattern) simulated mask only the simulated levels of each pattern take part;
+    patterns with none get NaN.
+    """
+    values = _simulated_only(populations, simulated)
+    n_noise, n_patterns, n_trials = values.shape
+    per_pattern = values.transpose(1, 0, 2).reshape(n_patterns, -1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # patterns with nothing simulated
+        edges = np.moveaxis(np.nanquantile(per_pattern, np.linspace(0, 1, n_bins + 1), axis=-1), 0, -1)
+    table = histogram(np.nan_to_num(values).transpose(1, 0, 2), np.nan_to_num(edges)[:, None, :])  # (pattern, noise, bins)
+    if simulated is None:
+        return contingency_chi_square(table)
+    # Levels that were not simulated become empty rows, which drop out of the test
+    table = table * np.asarray(simulated).T[..., None]
+    tested = np.asarray(simulated).any(axis=0)
+    return tuple(np.where(tested, value, np.nan) for value in contingency_chi_square(table))
+
+
+def resampling_weights(n_trials, n_resamples=n_resamples, rng=None):
+    """(resample, trial) counts of how often each trial is drawn in each bootstrap resample."""
+    rng = np.random.default_rng(rng)
+    return rng.multinomial(n_trials, np.full(n_trials, 1 / n_trials), size=n_resamples).astype(np.float64)
+
+
+def bootstrap(populations, n_resamples=n_resamples, confidence=confidence, rng=None, max_workers=None):
+    """Percentile confidence intervals for mean and CV of every cell.
+
+    Returns {"mean": ..., "cv": ...}, each (noise, pattern, 2) with the low and high bound.
+    Noise levels are processed in parallel threads; the matmuls release the GIL.
+    """
+    populations = np.asarray(populations, dtype=np.float64)
+    n_trials = populations.shape[-1]
+    weights = resampling_weights(n_trials, n_resamples, rng) / n_trials
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+
+    def level(values):
+        # values is (pattern, trial); each resampled moment is one matmul over every pattern
+        mean = values @ weights.T
+        second = (values ** 2) @ weights.T
+        std_dev = np.sqrt(np.maximum(second - mean ** 2, 0))
+        cv = std_dev / (mean + epsilon)
+        return (np.quantile(mean, quantiles, axis=-1).T, np.quantile(cv, quantiles, axis=-1).T)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        levels = list(executor.map(level, populations))
+    return {"mean": np.stack([mean for mean, _ in levels]), "cv": np.stack([cv for _, cv in levels])}
+
+
+def main():
+    store_path = sys.argv[1] if len(sys.argv) > 1 else 'sweep_results'
+    start_time = time.time()
+    store = SweepStore(store_path)
+    # Cells without simulated populations (not run yet, or emulated by a surrogate sweep)
+    # are left out of every test and get NaN
+    simulated = store.simulated()
+    if not simulated.all():
+        print(f"{int((~simulated).sum())} cells have no simulated populations and are left out")
+
+    # (statistic, dof, p) per cell; homogeneity and mean_chi_square are per
+    # pattern, so every noise row is the same
+    store.extra("goodness_of_fit", shape=(3,), fill=np.nan)[:] = np.stack(
+        goodness_of_fit(store.populations, simulated=simulated), axis=-1)
+    store.extra("homogeneity", shape=(3,), fill=np.nan)[:] = np.stack(
+        homogeneity(store.populations, simulated=simulated), axis=-1)[None]
+    stats = np.where(simulated[..., None], store.stats, np.nan)
+    store.extra("mean_chi_square", shape=(3,), fill=np.nan)[:] = np.stack(mean_chi_square(stats), axis=-1)[None]
+
+    intervals = bootstrap(store.populations)
+    left_out = ~simulated[..., None]
+    store.extra("mean_ci", shape=(2,), fill=np.nan)[:] = np.where(left_out, np.nan, intervals["mean"])
+    store.extra("cv_ci", shape=(2,), fill=np.nan)[:] = np.where(left_out, np.nan, intervals["cv"])
+    store.flush()
+
+    end_time = time.time()
+    print(f"Time taken to run the function: {end_time - start_time} seconds")
+
+
+if __name__ == '__main__':
+    main()
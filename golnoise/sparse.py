@@ -0,0 +1,117 @@
+# Unbounded-plane engine: live cells are kept in small dense tiles keyed by tile position
+# The fixed 59x59 / 64x64 / 60x80 boards either cut everything off at the edge or wrap it;
+# here a glider just keeps going, and only tiles that hold live cells (plus their
+# immediate neighbors while stepping) cost memory or time
+#
+# Each step gathers, for every live tile and the 8 tiles around it, a (tile_size + 2)
+# square with a one-cell halo from its neighbors, and applies the same rule as
+# engine.update: the neighbor count moved by +/-1 with probability noise, then B3/S23.
+# Tiles left empty afterwards are freed.
+
+import numpy as np
+
+from golnoise import engine
+
+tile_size = 32
+
+
+class SparseBoard:
+    """Live cells on an unbounded plane, stored as a dict of tile_size x tile_size tiles."""
+
+    def __init__(self, tile_size=tile_size):
+        self.tile_size = tile_size
+        self.tiles = {}
+
+    @classmethod
+    def from_array(cls, cells, row=0, col=0, tile_size=tile_size):
+        """Board with cells placed with its top-left corner at (row, col)."""
+        board = cls(tile_size)
+        for r, c in np.argwhere(cells):
+            board.set(row + r, col + c)
+        return board
+
+    def set(self, row, col, value=1):
+        key = (row // self.tile_size, col // self.tile_size)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if not value:
+                return
+            tile = self.tiles[key] = np.zeros((self.tile_size, self.tile_size), dtype=engine.state_dtype)
+        tile[row % self.tile_size, col % self.tile_size] = value
+
+    @property
+    def population(self):
+        return sum(int(tile.sum(dtype=np.int64)) for tile in self.tiles.values())
+
+    def bounds(self):
+        """(min row, min col, max row, max col) of the live cells, or None when empty."""
+        if not self.tiles:
+            return None
+        cells = self.live_cells()
+        return (*cells.min(axis=0), *cells.max(axis=0))
+
+    def live_cells(self):
+        """(n, 2) array of live (row, col) coordinates."""
+        parts = [np.argwhere(tile) + (key[0] * self.tile_size, key[1] * self.tile_size)
+                 for key, tile in self.tiles.items()]
+        return np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.int64)
+
+    def to_array(self, row, col, rows, cols):
+        """The window with top-left (row, col) as a dense array."""
+        out = np.zeros((rows, cols), dtype=engine.state_dtype)
+        size = self.tile_size
+        for (tile_row, tile_col), tile in self.tiles.items():
+            top, left = tile_row * size - row, tile_col * size - col
+            r0, c0 = max(top, 0), max(left, 0)
+            r1, c1 = min(top + size, rows), min(left + size, cols)
+            if r0 < r1 and c0 < c1:
+                out[r0:r1, c0:c1] = tile[r0 - top:r1 - top, c0 - left:c1 - left]
+        return out
+
+    def _padded(self, key):
+        """Tile at key with a one-cell halo copied from its 8 neighbors."""
+        size = self.tile_size
+        padded = np.zeros((size + 2, size + 2), dtype=engine.state_dtype)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                tile = self.tiles.get((key[0] + dr, key[1] + dc))
+                if tile is None:
+                    continue
+                # Rows/cols of the neighbor that land inside the padded window
+                src_rows = slice(0, size) if dr == 0 else (slice(size - 1, size) if dr < 0 else slice(0, 1))
+                src_cols = slice(0, size) if dc == 0 else (slice(size - 1, size) if dc < 0 else slice(0, 1))
+                dst_rows = slice(1, size + 1) if dr == 0 else (slice(0, 1) if dr < 0 else slice(size + 1, size + 2))
+                dst_cols = slice(1, size + 1) if dc == 0 else (slice(0, 1) if dc < 0 else slice(size + 1, size + 2))
+                padded[dst_rows, dst_cols] = tile[src_rows, src_cols]
+        return padded
+
+    def step(self, noise=0.0, rng=None):
+        """Advance one generation in place."""
+        if rng is None:
+            rng = np.random.default_rng()
+        size = self.tile_size
+
+        # Tiles that can hold live cells next generation: every live tile and its neighbors
+        active = {(row + dr, col + dc) for row, col in self.tiles for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+        keys = sorted(active)
+        if not keys:
+            return self
+
+        # Step all active tiles as one batch; the halo makes each tile independent
+        padded = np.stack([self._padded(key) for key in keys])
+        alive = engine.neighbor_count(padded)[:, 1:-1, 1:-1]
+        cells = padded[:, 1:-1, 1:-1]
+
+        if noise > 0:
+            alive = alive.astype(engine.count_dtype) + engine.count_noise(alive.shape, noise, rng, engine.count_dtype)
+
+        updated = ((alive == 3) | ((alive == 2) & (cells == 1))).astype(engine.state_dtype)
+
+        self.tiles = {key: tile for key, tile in zip(keys, updated) if tile.any()}
+        return self
+
+    def run(self, n_generations, noise=0.0, rng=None):
+        rng = np.random.default_rng(rng)
+        for _ in range(n_generations):
+            self.step(noise, rng)
+        return self
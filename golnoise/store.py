@@ -0,0 +1,117 @@
+# On-disk result store for a sweep over (noise level, 3x3 pattern)
+# One directory per sweep, every array a plain .npy opened as a memmap:
+#   meta.json          noise levels and run parameters
+#   stats.npy          (noise, pattern, 3) float64: mean, std dev, cv; NaN until written
+#   populations.npy    (noise, pattern, trial) int32: final population of every trial
+#   trajectories.npy   (noise, pattern, ...) recorder output, only when recording
+#   extra_<name>.npy   (noise, pattern, ...) arrays added by other stages, see extra()
+
+import os
+import csv
+import json
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+stat_names = ("mean", "std_dev", "cv")
+
+
+class SweepStore:
+    """Dense, memory-mapped arrays for every (noise level, pattern) cell of a sweep."""
+
+    def __init__(self, path, mode='r+'):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as file:
+            self.meta = json.load(file)
+        self.noise_levels = np.array(self.meta["noise_levels"])
+        self.stats = np.load(os.path.join(path, "stats.npy"), mmap_mode=mode)
+        self.populations = np.load(os.path.join(path, "populations.npy"), mmap_mode=mode)
+        trajectory_path = os.path.join(path, "trajectories.npy")
+        if os.path.exists(trajectory_path):
+            self.trajectories = np.load(trajectory_path, mmap_mode=mode)
+        else:
+            self.trajectories = None
+
+    @classmethod
+    def create(cls, path, noise_levels, n_patterns=512, n_trials=100, n_generations=256,
+               trajectory_shape=None, trajectory_dtype=np.int32, **meta):
+        """Lay out an empty store; trajectory_shape is the per-cell recorder shape.
+
+        Extras left in path by an earlier sweep are deleted.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("extra_") and name.endswith(".npy"):
+                os.remove(os.path.join(path, name))
+        noise_levels = [float(noise) for noise in noise_levels]
+        meta.update(noise_levels=noise_levels, n_patterns=n_patterns,
+                    n_trials=n_trials, n_generations=n_generations)
+        with open(os.path.join(path, "meta.json"), 'w') as file:
+            json.dump(meta, file, indent=2)
+
+        stats = open_memmap(os.path.join(path, "stats.npy"), mode='w+', dtype=np.float64,
+                            shape=(len(noise_levels), n_patterns, len(stat_names)))
+        stats[:] = np.nan
+        stats.flush()
+        open_memmap(os.path.join(path, "populations.npy"), mode='w+', dtype=np.int32,
+                    shape=(len(noise_levels), n_patterns, n_trials)).flush()
+        if trajectory_shape is not None:
+            open_memmap(os.path.join(path, "trajectories.npy"), mode='w+', dtype=trajectory_dtype,
+                        shape=(len(noise_levels), n_patterns) + tuple(trajectory_shape)).flush()
+        return cls(path)
+
+    def extra(self, name, dtype=np.float64, shape=(), fill=0):
+        """Open extra_<name>.npy, a (noise, pattern) + shape array, creating it if needed.
+
+        An existing file of another shape or dtype (left by a different sweep) is replaced.
+        """
+        filename = os.path.join(self.path, f"extra_{name}.npy")
+        if os.path.exists(filename):
+            array = np.load(filename, mmap_mode='r+')
+            if array.shape == self.stats.shape[:2] + tuple(shape) and array.dtype == np.dtype(dtype):
+                return array
+            del array
+        array = open_memmap(filename, mode='w+', dtype=dtype, shape=self.stats.shape[:2] + tuple(shape))
+        array[:] = fill
+        return array
+
+    def noise_index(self, noise):
+        """Index of the stored noise level closest to noise."""
+        return int(np.argmin(np.abs(self.noise_levels - noise)))
+
+    def write(self, noise_index, pattern, result, populations=None, trajectory=None):
+        self.stats[noise_index, pattern] = [result[name] for name in stat_names]
+        if populations is not None:
+            self.populations[noise_index, pattern] = populations
+        if trajectory is not None:
+            self.trajectories[noise_index, pattern] = trajectory
+
+    def completed(self):
+        """Boolean (noise, pattern) mask of cells that have been written."""
+        return ~np.isnan(self.stats[..., 0])
+
+    def simulated(self):
+        """Boolean (noise, pattern) mask of cells whose populations were simulated.
+
+        Differs from completed() only in surrogate sweeps, whose emulated cells have stats
+        but no populations (see surrogate.py).
+        """
+        filename = os.path.join(self.path, "extra_simulated.npy")
+        if os.path.exists(filename):
+            return np.load(filename) & self.completed()
+        return self.completed()
+
+    def flush(self):
+        for array in (self.stats, self.populations, self.trajectories):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def to_csv(self, filename):
+        """Write the completed cells in the Convolve3.0.py output1.csv layout."""
+        done = self.completed()
+        with open(filename, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Noise Level", "Combination", "Mean", "Std Dev", "CV"])
+            for noise_index, pattern in zip(*np.nonzero(done)):
+                mean, std_dev, cv = self.stats[noise_index, pattern]
+                writer.writerow([self.noise_levels[noise_index], pattern, mean, std_dev, cv])
@@ -0,0 +1,156 @@
+# Surrogate-assisted sweep: simulate a designed subset of (noise, pattern) cells, emulate
+# the rest, then simulate only where the emulator is unsure
+# Run from the repository root with: python3 -m golnoise.surrogate
+#
+# Patterns that are rotations or reflections of each other are treated as one (the seed
+# sits within half a cell of the board centre, so their statistics agree up to that),
+# which leaves 102 pattern classes. Each class gets a Gaussian process over noise level
+# for the mean and one for the std dev, with the Monte Carlo standard error of each
+# simulated cell as its observation noise. Noise 0 is deterministic and often differs
+# sharply from 0.01, so it is always simulated (cheap with HashLife) and kept out of the fit.
+#
+# Only stats.npy is filled for emulated cells: their populations and census rows stay zero.
+# extra_simulated.npy marks the cells that were really simulated (SweepStore.simulated()),
+# and significance and query leave the others out; extra_uncertainty.npy holds the std dev
+# of every cell's mean population
+
+import time
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from golnoise import sweep
+
+tolerance = 0.5  # largest predicted std of a cell's mean population left unsimulated
+initial_stride = 10  # simulate every 10th noise level up front
+max_rounds = 50
+length_scales = (0.03, 0.06, 0.12, 0.25, 0.5)
+
+
+def symmetries(pattern):
+    """Decimal numbers of the 8 rotations and reflections of a 3x3 pattern."""
+    matrix = sweep.combinations[pattern]
+    images = []
+    for flipped in (matrix, matrix.T):
+        for turns in range(4):
+            images.append(sweep.binary_matrix_to_decimal(np.rot90(flipped, turns)))
+    return images
+
+
+def pattern_classes():
+    """Map each class representative (smallest member) to its member patterns."""
+    classes = {}
+    for pattern in range(len(sweep.combinations)):
+        classes.setdefault(min(symmetries(pattern)), []).append(pattern)
+    return classes
+
+
+def _rbf(x1, x2, length):
+    return np.exp(-0.5 * ((x1[:, None] - x2[None, :]) / length) ** 2)
+
+
+def fit_gp(x, y, y_var):
+    """Constant-mean RBF Gaussian process; the length scale maximizes the likelihood."""
+    mean = y.mean()
+    signal = max(y.var(), 1e-6)
+    best = None
+    for length in length_scales:
+        covariance = signal * _rbf(x, x, length) + np.diag(y_var + 1e-8 * signal)
+        factor = cho_factor(covariance, lower=True)
+        alpha = cho_solve(factor, y - mean)
+        log_likelihood = -0.5 * (y - mean) @ alpha - np.log(np.diag(factor[0])).sum()
+        if best is None or log_likelihood > best[0]:
+            best = (log_likelihood, length, factor, alpha)
+    _, length, factor, alpha = best
+    return {"x": x, "mean": mean, "signal": signal, "length": length, "factor": factor, "alpha": alpha}
+
+
+def predict_gp(gp, x_new):
+    """Predictive mean and std dev at x_new."""
+    cross = gp["signal"] * _rbf(x_new, gp["x"], gp["length"])
+    mean = gp["mean"] + cross @ gp["alpha"]
+    variance = gp["signal"] - np.sum(cross * cho_solve(gp["factor"], cross.T).T, axis=1)
+    return mean, np.sqrt(np.maximum(variance, 0))
+
+
+def emulate(store, simulated, classes, uncertainty):
+    """Fill every unsimulated cell from its class's processes, recording its uncertainty.
+
+    uncertainty is the std dev of each cell's mean population: the Monte Carlo standard
+    error where the cell, or its class representative, was simulated at that level, and
+    the process's predictive std dev elsewhere.
+    """
+    noise = store.noise_levels
+    n_trials = store.meta["n_trials"]
+    for representative, members in classes.items():
+        known = simulated[:, representative]
+        fit = known & (noise > 0)
+        if not fit.any():
+            continue
+        observed = store.stats[fit, representative]
+        x = noise[fit]
+        mean_variance = observed[:, 1] ** 2 / n_trials  # squared standard error of each mean
+        mean, mean_std = predict_gp(fit_gp(x, observed[:, 0], mean_variance), noise)
+        std_dev, _ = predict_gp(fit_gp(x, observed[:, 1], mean_variance / 2), noise)
+
+        # The representative's measured levels, everything else the prediction
+        stats = np.empty((len(noise), 3))
+        stats[:, 0] = np.maximum(mean, 0)
+        stats[:, 1] = np.maximum(std_dev, 0)
+        stats[:, 2] = stats[:, 1] / (stats[:, 0] + 1e-7)
+        stats[known] = store.stats[known, representative]
+        mean_std[known] = stats[known, 1] / np.sqrt(n_trials)
+
+        for pattern in members:
+            rows = ~simulated[:, pattern]
+            store.stats[rows, pattern] = stats[rows]
+            uncertainty[rows, pattern] = mean_std[rows]
+            own = simulated[:, pattern]
+            uncertainty[own, pattern] = store.stats[own, pattern, 1] / np.sqrt(n_trials)
+
+
+def main():
+    start_time = time.time()
+
+    store = sweep.create_store(sweep.noise_values)
+    uncertainty = store.extra("uncertainty", fill=np.nan)
+    simulated = store.extra("simulated", dtype=bool, fill=False)
+    classes = pattern_classes()
+
+    # Design: every class representative at noise 0 and every initial_stride-th level
+    design_levels = sorted(set(range(0, len(store.noise_levels), initial_stride)) |
+                           {len(store.noise_levels) - 1})
+    cells = [(noise_index, representative) for noise_index in design_levels for representative in classes]
+
+    for round_number in range(max_rounds):
+        sweep.run_cells(store, cells)
+        for noise_index, pattern in cells:
+            simulated[noise_index, pattern] = True
+
+        emulate(store, simulated, classes, uncertainty)
+        store.flush()
+        simulated.flush()
+        uncertainty.flush()
+
+        # Next round: the least certain unsimulated noise level of every class that is still too unsure
+        cells = []
+        for representative in classes:
+            unsure = np.where(simulated[:, representative], -np.inf,
+                              np.nan_to_num(uncertainty[:, representative], nan=-np.inf))
+            worst = int(np.argmax(unsure))
+            if unsure[worst] > tolerance:
+                cells.append((worst, representative))
+        print(f"Round {round_number}: {int(simulated.sum())} cells simulated, "
+              f"{len(cells)} above tolerance")
+        if not cells:
+            break
+
+    end_time = time.time()
+    print(f"Time taken to run the function: {end_time - start_time} seconds")
+
+    store.to_csv("output1.csv")
+
+
+if __name__ == '__main__':
+    from golnoise.surrogate import main
+    main()
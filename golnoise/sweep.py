@@ -0,0 +1,216 @@
+# Batched rewrite of Convolve3.0.py: every 3x3 combination at every noise level
+# All n_trials of a combination run as one (n_trials, grid_size, grid_size) batch
+# Results land in a SweepStore directory (see store.py) and are exported to output1.csv
+# Run from the repository root with: python3 -m golnoise.sweep [--telemetry [port]]
+
+import argparse
+import os
+import time
+import itertools
+import multiprocessing
+
+import numpy as np
+
+from golnoise import census, engine, pool, telemetry
+from golnoise.store import SweepStore
+from golnoise.trajectory import TrajectoryRecorder
+
+n_trials = 100
+n_generations = 256
+grid_size = 64
+backend = 'auto'
+store_path = 'sweep_results'
+noise_values = np.arange(0, 1.01, 0.01)  # noise values from 0 to 1 in increments of 0.01
+
+# Noise levels of one combination stepped together as one batch, each trial with its own
+# noise (see engine.broadcast_batch); 1 runs every (noise, combination) cell on its own
+noise_batch = 8
+
+# Population trajectories: None records nothing between seed and final state,
+# otherwise the population is sampled every record_every generations
+record_every = None
+record_mode = 'stats'  # 'full' keeps every trial, 'stats' only the mean and std dev
+
+# Count the still lifes, oscillators and spaceships left in every trial (see census.py),
+# summed over trials into the store's extra_census.npy, one column per census.names
+take_census = True
+
+# Live progress at http://127.0.0.1:<telemetry_port>/ while cells run, off by default; turn
+# it on with python3 -m golnoise.sweep --telemetry [port] (or by setting this) and watch it
+# with: python3 -m golnoise.telemetry
+telemetry_port = None
+
+# Generate all possible 3x3 combinations; combination i is i in binary, top-left cell first
+combinations = list((np.arange(512)[:, None] >> np.arange(8, -1, -1) & 1).astype(np.uint8).reshape(-1, 3, 3))
+
+
+def binary_matrix_to_decimal(matrix):
+    flat_matrix = matrix.flatten()
+    binary_str = ''.join(map(str, flat_matrix))
+    decimal = int(binary_str, 2)
+    return decimal
+
+
+def seed_batch(combination, n_trials, grid_size, out=None):
+    """Place the 3x3 combination in the middle of n_trials empty grids."""
+    if out is None:
+        out = np.zeros((n_trials, grid_size, grid_size), dtype=engine.state_dtype)
+    else:
+        out.fill(0)
+    start_row = start_col = (grid_size - 3) // 2
+    out[:, start_row:start_row + 3, start_col:start_col + 3] = combination
+    return out
+
+
+def make_recorder(groups=1):
+    if record_every is None:
+        return None
+    return TrajectoryRecorder(groups * n_trials, n_generations, every=record_every, mode=record_mode, groups=groups)
+
+
+# Each worker allocates its state, scratch and recorder buffers once per batch size (number
+# of noise levels) and reuses them for every combination it is handed
+_buffers = {}
+
+
+def get_buffers(n_levels=1):
+    if n_levels not in _buffers:
+        shape = (n_levels * n_trials, grid_size, grid_size)
+        _buffers[n_levels] = (np.zeros(shape, dtype=engine.state_dtype),
+                              engine.make_scratch(shape, backend=backend), make_recorder(n_levels))
+    return _buffers[n_levels]
+
+
+def process_combination(params):
+    """Result for a combination at one noise level, or a list of them for a sequence of levels."""
+    combination, noise = params
+    levels = np.atleast_1d(noise)
+    start = time.time()
+    cells, scratch, recorder = get_buffers(len(levels))
+    seed_batch(combination, len(cells), grid_size, out=cells)
+    cells = engine.run(cells, np.repeat(levels, n_trials), n_generations, scratch=scratch, recorder=recorder)
+    all_sums = engine.population(cells).reshape(len(levels), n_trials)
+    if take_census:
+        counts = census.count(cells).reshape(len(levels), n_trials, -1).sum(axis=1)
+    elapsed = (time.time() - start) / len(levels)
+
+    results = []
+    for index, (level, sums) in enumerate(zip(levels, all_sums)):
+        mean = np.mean(sums)
+        std_dev = np.std(sums)
+
+        # Add a small constant to the denominator to prevent division by zero
+        epsilon = 1e-7
+        cv = std_dev/(mean + epsilon)
+
+        result = {"combination": combination, "noise level": level, "mean": mean, "std_dev": std_dev, "cv": cv,
+                  "populations": sums.astype(np.int32)}
+        if recorder is not None:
+            result["trajectory"] = recorder.result(index)
+        if take_census:
+            result["census"] = counts[index]
+        result.update(worker=os.getpid(), elapsed=elapsed, memory=telemetry.peak_memory())
+        results.append(result)
+    return results if np.ndim(noise) else results[0]
+
+
+def settings():
+    """The globals a worker needs to run cells the way this process would."""
+    names = ("n_trials", "n_generations", "grid_size", "backend", "record_every", "record_mode", "take_census",
+             "noise_batch")
+    return {name: globals()[name] for name in names}
+
+
+def create_store(noise_values):
+    recorder = make_recorder()
+    trajectory = {} if recorder is None else {"trajectory_shape": recorder.shape,
+                                              "trajectory_dtype": recorder.dtype}
+    return SweepStore.create(store_path, noise_values, n_patterns=len(combinations),
+                             n_trials=n_trials, n_generations=n_generations, grid_size=grid_size,
+                             record_every=record_every, record_mode=record_mode, **trajectory)
+
+
+def write_results(store, cells, results, progress=None):
+    counts = store.extra("census", np.int32, (len(census.names),)) if take_census else None
+    for (noise_index, pattern), result in zip(cells, results):
+        store.write(noise_index, pattern, result, result["populations"], result.get("trajectory"))
+        if counts is not None:
+            counts[noise_index, pattern] = result["census"]
+        if progress is not None:
+            progress.update(noise_index, result)
+    store.flush()
+    if counts is not None:
+        counts.flush()
+
+
+def batches(cells, noise_levels):
+    """Group cells by pattern into (pattern, noise indices) runs of up to noise_batch levels.
+
+    Noise 0 gets a run of its own, so engine.run can hand it to HashLife.
+    """
+    by_pattern = {}
+    for noise_index, pattern in cells:
+        by_pattern.setdefault(pattern, []).append(noise_index)
+    for pattern, indices in by_pattern.items():
+        noise_free = [index for index in indices if noise_levels[index] == 0]
+        noisy = [index for index in indices if noise_levels[index] != 0]
+        if noise_free:
+            yield pattern, noise_free
+        for start in range(0, len(noisy), noise_batch):
+            yield pattern, noisy[start:start + noise_batch]
+
+
+def run_cells(store, cells):
+    """Simulate each (noise index, pattern) cell and write it into store."""
+    groups = list(batches(cells, store.noise_levels))
+    params = [(combinations[pattern], store.noise_levels[indices]) for pattern, indices in groups]
+    cells = [(noise_index, pattern) for pattern, indices in groups for noise_index in indices]
+    progress = telemetry.Progress(store.noise_levels, cells, n_generations)
+    stop = None
+    if telemetry_port is not None:
+        try:
+            stop = telemetry.serve(progress, port=telemetry_port)
+        except OSError as error:
+            print(f"Telemetry disabled, cannot listen on port {telemetry_port}: {error}")
+
+    try:
+        if engine.resolve_backend(backend) == 'numba':
+            # The compiled kernel already spreads trials over every core with prange
+            results = itertools.chain.from_iterable(map(process_combination, params))
+            write_results(store, cells, results, progress)
+        else:
+            num_cpus = multiprocessing.cpu_count()  # get number of VCPUs
+            executor = pool.shared_pool(num_cpus, {process_combination.__module__: settings()})
+            results = executor.map(process_combination, params, chunksize=max(1, 16 // noise_batch))
+            write_results(store, cells, itertools.chain.from_iterable(results), progress)
+    finally:
+        if stop is not None:
+            stop()
+
+
+def main(argv=None):
+    global telemetry_port
+    parser = argparse.ArgumentParser(prog="python3 -m golnoise.sweep")
+    parser.add_argument("--telemetry", type=int, nargs="?", const=telemetry.port, metavar="PORT",
+                        help=f"serve live progress over HTTP (default port {telemetry.port})")
+    args = parser.parse_args(argv)
+    if args.telemetry is not None:
+        telemetry_port = args.telemetry
+
+    start_time = time.time()
+
+    store = create_store(noise_values)
+    cells = [(noise_index, binary_matrix_to_decimal(comb))
+             for noise_index in range(len(noise_values)) for comb in combinations]
+    run_cells(store, cells)
+
+    end_time = time.time()
+    print(f"Time taken to run the function: {end_time - start_time} seconds")
+
+    store.to_csv("output1.csv")
+
+
+if __name__ == '__main__':
+    # Through the real module, so workers unpickle process_combination from golnoise.sweep
+    from golnoise.sweep import main
+    main()
@@ -0,0 +1,157 @@
+# Live progress of a running sweep, served as JSON over HTTP from a background asyncio thread
+# sweep.run_cells feeds a Progress with every finished cell; `serve` publishes snapshots at
+# http://127.0.0.1:<port>/ and `python3 -m golnoise.telemetry [url]` draws a terminal
+# dashboard from them, refreshed every second until the sweep is gone
+#
+# Workers add their pid, busy seconds and peak memory to each result, which gives
+# generations per second and utilization per worker without any extra communication
+
+import asyncio
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+port = 8765
+refresh = 1.0  # seconds between dashboard redraws
+
+
+def peak_memory():
+    """Peak resident memory of this process in bytes (ru_maxrss is in KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Progress:
+    """Thread-safe counters for the cells of one run_cells call."""
+
+    def __init__(self, noise_levels, cells, n_generations):
+        self.noise_levels = [float(noise) for noise in noise_levels]
+        self.n_generations = n_generations
+        self.total = np.bincount([noise_index for noise_index, _ in cells], minlength=len(self.noise_levels))
+        self.done = np.zeros(len(self.noise_levels), dtype=np.int64)
+        self.workers = {}
+        self.start = time.time()
+        self._lock = threading.Lock()
+
+    def update(self, noise_index, result):
+        with self._lock:
+            self.done[noise_index] += 1
+            worker = self.workers.setdefault(result.get("worker", os.getpid()),
+                                             {"cells": 0, "busy": 0.0, "memory": 0})
+            worker["cells"] += 1
+            worker["busy"] += result.get("elapsed", 0.0)
+            worker["memory"] = max(worker["memory"], result.get("memory", 0))
+
+    def snapshot(self):
+        """Everything the dashboard shows, as plain JSON-ready types."""
+        with self._lock:
+            elapsed = time.time() - self.start
+            total, done = int(self.total.sum()), int(self.done.sum())
+            rate = done / elapsed if elapsed > 0 else 0.0
+            workers = {str(pid): {"cells": worker["cells"],
+                                  "generations_per_second": worker["cells"] * self.n_generations / worker["busy"]
+                                  if worker["busy"] > 0 else 0.0,
+                                  "utilization": worker["busy"] / elapsed if elapsed > 0 else 0.0,
+                                  "memory": worker["memory"]}
+                       for pid, worker in self.workers.items()}
+            return {"elapsed": elapsed, "total": total, "done": done,
+                    "eta": (total - done) / rate if rate > 0 else None,
+                    "noise_levels": self.noise_levels,
+                    "per_noise_total": self.total.tolist(), "per_noise_done": self.done.tolist(),
+                    "workers": workers, "memory": peak_memory()}
+
+
+def serve(progress, host='127.0.0.1', port=port):
+    """Serve progress.snapshot() on a daemon thread; call the returned function to stop."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    failed = []
+
+    async def handle(reader, writer):
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        body = json.dumps(progress.snapshot()).encode()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+        await writer.drain()
+        writer.close()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        try:
+            server = loop.run_until_complete(asyncio.start_server(handle, host, port))
+        except OSError as error:
+            failed.append(error)
+            loop.close()
+            return
+        finally:
+            ready.set()
+        loop.run_forever()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+    if failed:
+        raise failed[0]
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    return stop
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def render(snapshot, width=40):
+    """The dashboard for one snapshot, as text."""
+    done, total = snapshot["done"], snapshot["total"]
+    filled = width * done // total if total else width
+    lines = [f"[{'#' * filled}{'.' * (width - filled)}] {done}/{total} cells",
+             f"elapsed {format_duration(snapshot['elapsed'])}   eta {format_duration(snapshot['eta'])}"
+             f"   peak memory {snapshot['memory'] / 2 ** 20:.0f} MB", "",
+             "worker      cells    gen/s   util   memory"]
+    for pid, worker in sorted(snapshot["workers"].items()):
+        lines.append(f"{pid:<10} {worker['cells']:>6} {worker['generations_per_second']:>8.0f}"
+                     f" {worker['utilization']:>6.0%} {worker['memory'] / 2 ** 20:>6.0f} MB")
+
+    # Only noise levels still in progress, so the list stays short
+    lines += ["", "noise   done/total"]
+    for noise, level_done, level_total in zip(snapshot["noise_levels"], snapshot["per_noise_done"],
+                                              snapshot["per_noise_total"]):
+        if 0 < level_total and level_done < level_total:
+            lines.append(f"{noise:<7.2f} {level_done}/{level_total}")
+    return "\n".join(lines)
+
+
+def dashboard(url=f"http://127.0.0.1:{port}/"):
+    """Redraw the dashboard every refresh seconds until the sweep stops answering."""
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                snapshot = json.load(response)
+        except (urllib.error.URLError, ConnectionError):
+            print("No sweep running at", url)
+            return
+        print("\033[H\033[J" + render(snapshot), flush=True)
+        time.sleep(refresh)
+
+
+if __name__ == '__main__':
+    dashboard(*sys.argv[1:])
@@ -0,0 +1,71 @@
+# Per-generation population recording for the batched engine
+# Replaces the growing percent_alive lists in Graphing/graph.py and Graphs/Graph.py:
+# counts go into a buffer sized up front, so memory is fixed for the whole run
+#
+# mode='full'  keeps an int32 (trial, sample) array of live-cell counts
+# mode='stats' keeps only the across-trial mean and std per sample, (2, sample) float32
+#
+# A batch can hold several groups of trials (one per noise level when a sweep steps
+# several levels together); stats are then taken per group and result(group) returns one
+
+import numpy as np
+
+modes = ('full', 'stats')
+
+
+class TrajectoryRecorder:
+    """Record the population of every trial at generations 0, every, 2*every, ..."""
+
+    def __init__(self, n_trials, n_generations, every=1, mode='full', groups=1):
+        if mode not in modes:
+            raise ValueError(f"unknown mode {mode!r}, expected one of {modes}")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if n_trials % groups:
+            raise ValueError(f"{n_trials} trials do not split into {groups} equal groups")
+
+        self.n_trials = n_trials
+        self.n_generations = n_generations
+        self.every = every
+        self.mode = mode
+        self.groups = groups
+        self.generations = np.arange(0, n_generations + 1, every)
+
+        # Population of the current generation, reduced in place
+        self._counts = np.zeros(n_trials, dtype=np.int64)
+        if mode == 'full':
+            self.data = np.zeros((n_trials, len(self.generations)), dtype=np.int32)
+        else:
+            self.data = np.zeros((groups, 2, len(self.generations)), dtype=np.float32)
+
+    @property
+    def shape(self):
+        """Shape of the result of one group."""
+        return self.data.shape[1:] if self.mode == 'stats' else (self.n_trials // self.groups,) + self.data.shape[1:]
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def reset(self):
+        self.data.fill(0)
+
+    def record(self, generation, cells):
+        """Store the population of cells if generation is one of the sampled ones."""
+        if generation % self.every:
+            return
+        sample = generation // self.every
+        counts = cells.sum(axis=(-2, -1), dtype=np.int64, out=self._counts)
+        if self.mode == 'full':
+            self.data[:, sample] = counts
+        else:
+            per_group = counts.reshape(self.groups, -1)
+            self.data[:, 0, sample] = per_group.mean(axis=1)
+            self.data[:, 1, sample] = per_group.std(axis=1)
+
+    def result(self, group=0):
+        """Copy of the recorded data of one group, safe to keep after reset()."""
+        if self.mode == 'stats':
+            return self.data[group].copy()
+        size = self.n_trials // self.groups
+        return self.data[group * size:(group + 1) * size].copy()
@@ -2,16 +2,21 @@
 # Click cells to make alive and set initial configuration
 # Press 'd' if you want to shift into setting cells dead. Make sure to click 'd' again to switch to setting cells alive
 # The borders are unwrapped, meaning that the cells on one edge won't interact with cells on the other edge
+# Press 'j' to jump ahead jump_generations at once (computed with HashLife, see golnoise/hashlife.py)
 import time
 import pygame
 import numpy as np
 
+from golnoise import hashlife
+
 COLOR_BG = (10, 10, 10)
 COLOR_GRID = (40, 40, 40)
 COLOR_DIE_NEXT = (170, 170, 170)
 COLOR_ALIVE_NEXT = (255, 255, 255)
 COLOR_DEAD = (0, 0, 0)
 
+jump_generations = 2 ** 10
+
 def update(screen, cells, size, with_progress=False):
     n_rows, n_cols = cells.shape
     updated_cells = np.zeros_like(cells)
@@ -78,6 +83,10 @@ def main():
                     pygame.display.update()
                 elif event.key == pygame.K_d:
                     cell_deactivation = not cell_deactivation
+                elif event.key == pygame.K_j:
+                    cells = hashlife.run(cells, jump_generations).astype(cells.dtype)
+                    update(screen, cells, 10)
+                    pygame.display.update()
             if pygame.mouse.get_pressed()[0]:
                 pos = pygame.mouse.get_pos()
                 if cell_deactivation:
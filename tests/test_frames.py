@@ -0,0 +1,25 @@
+import numpy as np
+
+from golnoise.frames import FrameStore, export
+
+
+def test_float_board_round_trips(tmp_path):
+    rng = np.random.default_rng(0)
+    boards = [(rng.random((60, 80)) < 0.3).astype(np.float64) for _ in range(5)]
+    boards.append(boards[-1].copy())
+    boards[-1][10, 10] = 1 - boards[-1][10, 10]  # small change, stored as a delta
+    with FrameStore(str(tmp_path / "history"), (60, 80), mode='w') as store:
+        for board in boards:
+            store.append(board)
+        assert np.array_equal(store.frame(2), boards[2])
+    stored = FrameStore(str(tmp_path / "history"))
+    for generation, board in enumerate(boards):
+        assert np.array_equal(stored.frame(generation), board)
+
+
+def test_export_float_grid(tmp_path):
+    cells = np.zeros((8, 8))
+    cells[3, 2:5] = 1
+    store = export(lambda grid: grid.T.copy(), cells, 3, str(tmp_path / "blinker"))
+    assert len(store) == 4
+    assert np.array_equal(store.frame(1), cells.T)
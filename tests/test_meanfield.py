@@ -0,0 +1,16 @@
+import numpy as np
+
+from golnoise import meanfield
+
+
+def test_monte_carlo_returns_one_density_per_generation():
+    densities = meanfield.monte_carlo(0.3, 0.01, 5, shape=(16, 16), n_trials=4, rng=0)
+    assert densities.shape == (6,)
+    assert np.all((densities >= 0) & (densities <= 1))
+    assert abs(densities[0] - 0.3) < 0.1
+
+
+def test_compare_gap_is_a_density_difference():
+    gaps = meanfield.compare(0.3, [0.0, 0.1], 5, shape=(16, 16), n_trials=4, rng=0)
+    assert gaps["mean_field"].shape == gaps["pair"].shape == (2,)
+    assert np.all(gaps["pair"] < 1)
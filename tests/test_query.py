@@ -0,0 +1,34 @@
+import csv
+import os
+
+import numpy as np
+
+from golnoise.query import Results
+
+csvs = os.path.join(os.path.dirname(__file__), os.pardir, "csvs")
+
+
+def test_highest_tolerated_reproduces_the_toleration_table():
+    results = Results.from_csv(os.path.join(csvs, "100Trials.csv"))
+    levels = results.highest_tolerated()
+    with open(os.path.join(csvs, "HighestLevelofToleration.csv"), newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 512
+    for row in rows:
+        pattern = int(row["Combination"])
+        if row["Highest Level of Toleration"] == "N/A":
+            assert np.isnan(levels[pattern])
+        else:
+            assert levels[pattern] == float(row["Highest Level of Toleration"])
+            mean = results.tensor[pattern, results.noise_index(levels[pattern]), 0]
+            assert np.isclose(mean, float(row["Mean"]))
+
+
+def test_crossings_stop_at_the_first_drop():
+    # Dies at 0.1, comes back at 0.2; dead from the start; never dies
+    means = np.array([[5.0, 0.0, 3.0], [0.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+    tensor = np.stack([means, means, means], axis=-1)
+    results = Results([0.0, 0.1, 0.2], tensor)
+    assert list(results.crossings()) == [0, -1, 2]
+    assert np.isnan(results.highest_tolerated(1))
+    assert results.highest_tolerated(0) == 0.0
@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+
+from golnoise import significance
+from golnoise.query import Results
+
+csvs = os.path.join(os.path.dirname(__file__), os.pardir, "csvs")
+
+
+def test_mean_chi_square_reproduces_the_493_sheet():
+    results = Results.from_csv(os.path.join(csvs, "100Trials.csv"))
+    stats = results.tensor.transpose(1, 0, 2)  # (noise, pattern, stat) as in a SweepStore
+    levels = [results.noise_index(noise) for noise in (0.01, 0.02, 0.03)]
+    statistic, dof, p = significance.mean_chi_square(stats, 'std_dev', levels, expected=[18.2, 11.06, 7.23])
+    assert abs(statistic[493] - 37.0686) < 0.01
+    assert dof[493] == 3
+    assert p[493] < 0.001
+
+
+def test_mean_chi_square_skips_missing_cells():
+    stats = np.full((3, 2, 3), 2.0)
+    stats[:, 1, 1] = [1.0, 3.0, np.nan]
+    statistic, dof, _ = significance.mean_chi_square(stats)
+    assert list(dof) == [3, 2]
+    # Expected values are the per-level averages 1.5, 2.5 and 2
+    assert np.isclose(statistic[1], 0.5 ** 2 / 1.5 + 0.5 ** 2 / 2.5)
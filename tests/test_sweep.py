@@ -0,0 +1,37 @@
+import numpy as np
+
+from golnoise import census, sweep
+from golnoise.store import SweepStore
+
+
+def run_sweep(monkeypatch, path, noise_values, patterns):
+    monkeypatch.setattr(sweep, "store_path", str(path))
+    monkeypatch.setattr(sweep, "n_trials", 4)
+    monkeypatch.setattr(sweep, "n_generations", 12)
+    monkeypatch.setattr(sweep, "grid_size", 16)
+    monkeypatch.setattr(sweep, "backend", "numba" if sweep.engine.resolve_backend() == "numba" else "numpy")
+    store = sweep.create_store(noise_values)
+    sweep.run_cells(store, [(noise_index, pattern) for noise_index in range(len(noise_values))
+                            for pattern in patterns])
+    return SweepStore(str(path))
+
+
+def test_rerun_with_other_noise_levels_into_one_store(tmp_path, monkeypatch):
+    run_sweep(monkeypatch, tmp_path, [0.0, 0.1], [7, 56])
+    store = run_sweep(monkeypatch, tmp_path, [0.0, 0.05, 0.1, 0.2], [7, 56, 146])
+
+    assert store.stats.shape[0] == 4
+    assert store.simulated().sum() == 12
+    counts = store.extra("census", np.int32, (len(census.names),))
+    assert counts.shape == (4, 512, len(census.names))
+    # A row blinker in the middle of a dead board stays a blinker without noise
+    assert counts[0, 7, census.names.index("blinker")] == 4
+    assert counts[:, 0].sum() == 0
+
+
+def test_extra_of_another_shape_is_replaced(tmp_path):
+    store = SweepStore.create(str(tmp_path), [0.0, 0.1, 0.2, 0.3], n_patterns=4, n_trials=2)
+    np.save(tmp_path / "extra_census.npy", np.ones((2, 4, 3), dtype=np.int32))
+    counts = store.extra("census", np.int32, (5,))
+    assert counts.shape == (4, 4, 5) and not counts.any()
+    assert store.extra("census", np.float64, (5,)).dtype == np.float64